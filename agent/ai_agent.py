@@ -4,42 +4,227 @@ Handles interaction with local LLMs (Ollama, GPT4All) or OpenAI API
 """
 
 import os
+import re
 import json
-import aiofiles
+import string
+import hashlib
 import asyncio
 from typing import Dict, List, Any, Optional
 from pathlib import Path
-import requests
-from openai import OpenAI
+import httpx
+from cachetools import TTLCache
+from openai import AsyncOpenAI
+
+# orjson parses the per-token NDJSON lines and change responses several
+# times faster than stdlib json; fall back when it isn't installed
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+# Directories never worth descending into during repo analysis
+SKIP_DIRS = frozenset({'node_modules', '__pycache__', '.git', 'venv', '.env'})
+
+# Prompt skeletons compiled once at import; per-call work is a single
+# substitute() instead of rebuilding the whole string
+_ANALYSIS_TMPL = string.Template("""
+I need you to analyze this codebase and understand its structure to help implement the following change:
+
+**User Request:** $user_prompt
+
+Please provide:
+1. What type of project this is (web app, library, CLI tool, etc.)
+2. What technologies/frameworks are being used
+3. The main entry points and important modules
+4. How the requested change should be implemented
+5. What files will likely need to be modified
+6. Any potential challenges or considerations
+
+Provide a clear, concise analysis that will help guide the code generation process.
+""")
+
+_GENERATION_TMPL = string.Template("""
+Based on the following codebase analysis, generate specific code changes to implement the user's request.
+
+**Codebase Analysis:**
+$analysis_text
+
+**User Request:** $user_prompt
+
+Please generate the changes in the following JSON format:
+
+```json
+{
+  "changes": [
+    {
+      "action": "create|modify|delete",
+      "file_path": "relative/path/to/file",
+      "content": "full file content for create/modify, empty for delete",
+      "description": "what this change does"
+    }
+  ],
+  "summary": "overall description of changes"
+}
+```
+
+Requirements:
+- Provide complete file content for new/modified files
+- Use proper indentation and formatting
+- Follow the existing code style and patterns
+- Include appropriate error handling
+- Add comments where helpful
+- Ensure the changes work together as a cohesive solution
+
+Generate practical, working code that implements the requested feature.
+""")
+
+async def _read_text(path: Path) -> str:
+    """Read a small text file off the event loop via a worker thread"""
+    return await asyncio.to_thread(path.read_text, encoding='utf-8', errors='replace')
+
+# Shared incremental decoder + fenced-block fast path for change responses
+_JSON_DECODER = json.JSONDecoder()
+_JSON_FENCE_RE = re.compile(r'```json\s*(\{.*?\})\s*```', re.S)
+
+# Compiled once; used by compress() on every prompt before dispatch
+_CODE_FENCE_RE = re.compile(r'```.*?```', re.S)
+_PLEASANTRY_RE = re.compile(r'\b(?:please |could you |kindly )', re.I)
+_BLANK_RUN_RE = re.compile(r'\n{3,}')
+_SPACE_RUN_RE = re.compile(r'[ \t]{2,}')
+_ARTICLE_RE = re.compile(r'\b[Tt]he ')
+
+def compress(text: str, level: str = "standard") -> str:
+    """Shrink a prompt's token count without touching fenced code blocks
+
+    "standard" strips pleasantries and collapses whitespace runs; "full"
+    additionally drops articles for maximum token savings.
+    """
+    # Protect code fences so file content survives untouched
+    fences = _CODE_FENCE_RE.findall(text)
+    text = _CODE_FENCE_RE.sub('\0', text)
+
+    text = _PLEASANTRY_RE.sub('', text)
+    text = _SPACE_RUN_RE.sub(' ', text)
+    text = _BLANK_RUN_RE.sub('\n\n', text)
+    if level == "full":
+        text = _ARTICLE_RE.sub('', text)
+
+    for fence in fences:
+        text = text.replace('\0', fence, 1)
+
+    return text.strip()
+
+class _QueryBatcher:
+    """Coalesces concurrent AI queries into small dispatch batches
+
+    Queries submitted within a short window are dispatched together with
+    asyncio.gather, so concurrent sessions hit the model server as one
+    batch instead of serializing one request at a time.
+    """
+
+    def __init__(self, dispatch, window: float = 0.02, max_batch: int = 8):
+        self._dispatch = dispatch
+        self._window = window
+        self._max_batch = max_batch
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._drain_task: Optional[asyncio.Task] = None
+
+    async def submit(self, *args) -> str:
+        """Queue a query and wait for its result"""
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((future, args))
+        if self._drain_task is None or self._drain_task.done():
+            self._drain_task = asyncio.create_task(self._drain())
+        return await future
+
+    async def _drain(self):
+        """Collect queued queries and dispatch each batch concurrently"""
+        while not self._queue.empty():
+            # Short collection window lets concurrent callers pile in
+            await asyncio.sleep(self._window)
+
+            batch = []
+            while not self._queue.empty() and len(batch) < self._max_batch:
+                batch.append(self._queue.get_nowait())
+
+            if batch:
+                await asyncio.gather(*[self._run(future, args) for future, args in batch])
+
+    async def _run(self, future: asyncio.Future, args):
+        try:
+            result = await self._dispatch(*args)
+            if not future.cancelled():
+                future.set_result(result)
+        except Exception as e:
+            if not future.cancelled():
+                future.set_exception(e)
 
 class AIAgent:
-    def __init__(self, model: str = "codellama"):
+    def __init__(self, model: str = "codellama", on_token=None):
         self.model = model
         self.ollama_base_url = os.getenv('OLLAMA_BASE_URL', 'http://localhost:11434')
         self.openai_api_key = os.getenv('OPENAI_API_KEY')
-        
+
+        # Optional callback invoked with each generated token chunk, so
+        # consumers (e.g. SSE sessions) can show progress before the full
+        # response is available
+        self.on_token = on_token
+
+        # Cache AI responses so identical prompts skip the network entirely
+        self._resp_cache = TTLCache(maxsize=512, ttl=3600)
+        self._inflight_locks: Dict[str, asyncio.Lock] = {}
+
+        # Shared HTTP client (created lazily so it binds to the running loop)
+        self._http: Optional[httpx.AsyncClient] = None
+
+        # Micro-batcher coalescing concurrent queries into shared dispatches
+        self._batcher = _QueryBatcher(self._query_ai_uncached)
+
+        # Repo structure cache, invalidated when any top-level entry's mtime changes
+        self._struct_cache: Dict[str, tuple] = {}
+
+        # Built repo context blocks, reused verbatim across analyze/generate
+        # so the expensive structure+key-files block is serialized once
+        self._ctx_cache: Dict[str, tuple] = {}
+
         # Initialize OpenAI client if API key is provided
         self.openai_client = None
         if self.openai_api_key and self.openai_api_key != 'your_openai_api_key_here':
-            self.openai_client = OpenAI(api_key=self.openai_api_key)
+            self.openai_client = AsyncOpenAI(api_key=self.openai_api_key)
+
+    def _get_http_client(self) -> httpx.AsyncClient:
+        """Return the shared async HTTP client, creating it on first use"""
+        if self._http is None or self._http.is_closed:
+            self._http = httpx.AsyncClient(
+                http2=True,
+                timeout=120.0,
+                limits=httpx.Limits(max_keepalive_connections=32, max_connections=64)
+            )
+        return self._http
+
+    async def aclose(self):
+        """Close the shared HTTP client"""
+        if self._http is not None and not self._http.is_closed:
+            await self._http.aclose()
     
     async def analyze_codebase(self, repo_path: str, prompt: str) -> Dict[str, Any]:
         """
         Analyze the codebase to understand structure and context
         """
         try:
-            # Get repository structure
-            structure = await self._get_repo_structure(repo_path)
-            
-            # Read key files (README, package.json, requirements.txt, etc.)
-            key_files = await self._read_key_files(repo_path)
-            
-            # Analyze with AI
-            analysis_prompt = self._build_analysis_prompt(structure, key_files, prompt)
-            
+            # Get structure, key files and the serialized context block
+            # (cached per checkout state, see _get_repo_context)
+            structure, key_files, repo_context = await self._get_repo_context(repo_path)
+
+            # Analyze with AI - the large stable repo context goes first so
+            # provider-side prefix caches can reuse it across user prompts
+            analysis_prompt = self._build_analysis_prompt(prompt)
+
             analysis_result = await self._query_ai(
                 prompt=analysis_prompt,
-                system_message="You are a senior software engineer analyzing a codebase to understand its structure and plan modifications."
+                system_message="You are a senior software engineer analyzing a codebase to understand its structure and plan modifications.",
+                context=repo_context
             )
             
             return {
@@ -57,13 +242,18 @@ class AIAgent:
         Generate specific code changes based on the prompt and analysis
         """
         try:
+            # Reuse the context block built during analysis byte-for-byte so
+            # provider-side prefix caches hit on the analyze -> generate flow
+            _, _, repo_context = await self._get_repo_context(repo_path)
+
             # Build the code generation prompt
             generation_prompt = self._build_generation_prompt(prompt, analysis)
-            
+
             # Get AI response
             changes_result = await self._query_ai(
                 prompt=generation_prompt,
-                system_message="You are an expert software engineer. Generate specific, actionable code changes in JSON format."
+                system_message="You are an expert software engineer. Generate specific, actionable code changes in JSON format.",
+                context=repo_context
             )
             
             # Parse the changes (expecting JSON format)
@@ -77,32 +267,84 @@ class AIAgent:
         except Exception as e:
             raise Exception(f"Failed to generate changes: {str(e)}")
     
+    async def _get_repo_context(self, repo_path: str) -> tuple:
+        """Build the structure/key-files context block once per checkout state
+
+        Analyze and generate both need the same large block; serializing it
+        once (and reusing it byte-for-byte) roughly halves input tokens for
+        the two-step flow and keeps the prefix stable for provider caches.
+        """
+        signature = self._structure_signature(repo_path)
+        cached = self._ctx_cache.get(repo_path)
+        if cached is not None and signature is not None and cached[0] == signature:
+            return cached[1], cached[2], cached[3]
+
+        structure = await self._get_repo_structure(repo_path)
+        key_files = await self._read_key_files(repo_path)
+        repo_context = self._build_repo_context(structure, key_files)
+
+        self._ctx_cache[repo_path] = (signature, structure, key_files, repo_context)
+        return structure, key_files, repo_context
+
+    def _structure_signature(self, repo_path: str) -> Optional[int]:
+        """Cheap change signature: newest mtime among top-level entries"""
+        try:
+            return max(
+                (entry.stat(follow_symlinks=False).st_mtime_ns
+                 for entry in os.scandir(repo_path)
+                 if not entry.name.startswith('.')),
+                default=0
+            )
+        except OSError:
+            return None
+
     async def _get_repo_structure(self, repo_path: str) -> Dict[str, Any]:
         """Get the repository file structure"""
+
+        # Skip the walk entirely when the checkout hasn't changed
+        sig = self._structure_signature(repo_path)
+        if sig is not None:
+            cached = self._struct_cache.get(repo_path)
+            if cached is not None and cached[0] == sig:
+                return cached[1]
+
         structure = {"files": [], "directories": []}
-        
+
         try:
-            repo_pathlib = Path(repo_path)
-            
-            # Walk through the repository
-            for item in repo_pathlib.rglob("*"):
-                # Skip hidden files and common build/cache directories
-                if any(part.startswith('.') for part in item.parts):
-                    continue
-                if any(skip_dir in str(item) for skip_dir in ['node_modules', '__pycache__', '.git', 'venv', '.env']):
-                    continue
-                    
-                relative_path = str(item.relative_to(repo_pathlib))
-                
-                if item.is_file():
+            # Walk the tree, pruning skipped directories at the source so we
+            # never descend into node_modules/.git at all
+            for root, dirs, files in os.walk(repo_path):
+                dirs[:] = [d for d in dirs if not d.startswith('.') and d not in SKIP_DIRS]
+
+                rel_root = os.path.relpath(root, repo_path)
+                if rel_root == '.':
+                    rel_root = ''
+
+                for d in dirs:
+                    structure["directories"].append(os.path.join(rel_root, d) if rel_root else d)
+
+                for name in files:
+                    if name.startswith('.'):
+                        continue
+                    file_path = os.path.join(root, name)
+                    try:
+                        size = os.lstat(file_path).st_size
+                    except OSError:
+                        continue
                     structure["files"].append({
-                        "path": relative_path,
-                        "size": item.stat().st_size,
-                        "extension": item.suffix
+                        "path": os.path.join(rel_root, name) if rel_root else name,
+                        "size": size,
+                        "extension": os.path.splitext(name)[1]
                     })
-                elif item.is_dir():
-                    structure["directories"].append(relative_path)
-            
+
+            # Sort once here so every downstream [:50]/[:20] slice is
+            # deterministic and context builders don't re-sort per call
+            structure["files"].sort(key=lambda f: f['path'])
+            structure["directories"].sort()
+
+            if sig is not None:
+                self._struct_cache[repo_path] = (sig, structure)
+
             return structure
             
         except Exception as e:
@@ -120,38 +362,43 @@ class AIAgent:
         ]
         
         repo_pathlib = Path(repo_path)
-        
-        for pattern in key_file_patterns:
-            file_path = repo_pathlib / pattern
-            if file_path.exists() and file_path.is_file():
-                try:
-                    async with aiofiles.open(file_path, 'r', encoding='utf-8') as f:
-                        content = await f.read()
-                        # Limit content size to avoid token limits
-                        if len(content) > 5000:
-                            content = content[:5000] + "\\n... (truncated)"
-                        key_files[pattern] = content
-                except Exception as e:
-                    key_files[pattern] = f"Error reading file: {str(e)}"
-        
+
+        # One scandir of the repo root replaces a stat syscall per pattern
+        try:
+            existing = {entry.name for entry in os.scandir(repo_path) if entry.is_file()}
+        except OSError:
+            return key_files
+
+        async def _read_one(name: str):
+            try:
+                content = await _read_text(repo_pathlib / name)
+                # Limit content size to avoid token limits
+                if len(content) > 5000:
+                    content = content[:5000] + "\\n... (truncated)"
+                return name, content
+            except Exception as e:
+                return name, f"Error reading file: {str(e)}"
+
+        # Read all key files concurrently instead of one await at a time
+        results = await asyncio.gather(*[_read_one(n) for n in key_file_patterns if n in existing])
+        for name, content in results:
+            key_files[name] = content
+
         return key_files
     
-    def _build_analysis_prompt(self, structure: Dict[str, Any], key_files: Dict[str, str], user_prompt: str) -> str:
-        """Build the prompt for codebase analysis"""
-        
+    def _build_repo_context(self, structure: Dict[str, Any], key_files: Dict[str, str]) -> str:
+        """Build the static repository context block (byte-stable across calls)"""
+
+        # Structure lists come pre-sorted from _get_repo_structure, so the
+        # slices are stable and the prefix bytes don't drift between calls
         files_list = "\\n".join([f"- {f['path']} ({f.get('extension', 'no ext')})" for f in structure['files'][:50]])
         dirs_list = "\\n".join([f"- {d}/" for d in structure['directories'][:20]])
-        
-        key_files_content = ""
-        for filename, content in key_files.items():
-            key_files_content += f"\\n### {filename}\\n```\\n{content}\\n```\\n"
-        
-        return f"""
-I need you to analyze this codebase and understand its structure to help implement the following change:
 
-**User Request:** {user_prompt}
+        key_files_content = ""
+        for filename in sorted(key_files):
+            key_files_content += f"\\n### {filename}\\n```\\n{key_files[filename]}\\n```\\n"
 
-**Repository Structure:**
+        return f"""**Repository Structure:**
 
 **Files:**
 {files_list}
@@ -160,76 +407,48 @@ I need you to analyze this codebase and understand its structure to help impleme
 {dirs_list}
 
 **Key Files Content:**
-{key_files_content}
+{key_files_content}""".rstrip()
 
-Please provide:
-1. What type of project this is (web app, library, CLI tool, etc.)
-2. What technologies/frameworks are being used
-3. The main entry points and important modules
-4. How the requested change should be implemented
-5. What files will likely need to be modified
-6. Any potential challenges or considerations
+    def _build_analysis_prompt(self, user_prompt: str) -> str:
+        """Build the variable (per-request) part of the analysis prompt"""
+
+        return compress(_ANALYSIS_TMPL.substitute(user_prompt=user_prompt))
 
-Provide a clear, concise analysis that will help guide the code generation process.
-"""
-    
     def _build_generation_prompt(self, user_prompt: str, analysis: Dict[str, Any]) -> str:
         """Build the prompt for code generation"""
-        
-        return f"""
-Based on the following codebase analysis, generate specific code changes to implement the user's request.
-
-**User Request:** {user_prompt}
-
-**Codebase Analysis:**
-{analysis.get('analysis_text', 'No analysis available')}
 
-**Repository Structure:**
-Files: {len(analysis.get('structure', {}).get('files', []))} files
-Key files: {', '.join(analysis.get('key_files', {}).keys())}
-
-Please generate the changes in the following JSON format:
-
-```json
-{{
-  "changes": [
-    {{
-      "action": "create|modify|delete",
-      "file_path": "relative/path/to/file",
-      "content": "full file content for create/modify, empty for delete",
-      "description": "what this change does"
-    }}
-  ],
-  "summary": "overall description of changes"
-}}
-```
-
-Requirements:
-- Provide complete file content for new/modified files
-- Use proper indentation and formatting
-- Follow the existing code style and patterns
-- Include appropriate error handling
-- Add comments where helpful
-- Ensure the changes work together as a cohesive solution
-
-Generate practical, working code that implements the requested feature.
-"""
+        return compress(_GENERATION_TMPL.substitute(
+            analysis_text=analysis.get('analysis_text', 'No analysis available'),
+            user_prompt=user_prompt
+        ))
     
     def _parse_changes_response(self, response: str) -> List[Dict[str, Any]]:
         """Parse the AI response to extract code changes"""
         try:
-            # Try to find JSON in the response
-            start_idx = response.find('{')
-            end_idx = response.rfind('}') + 1
-            
-            if start_idx == -1 or end_idx == 0:
+            # Fast path: a fenced ```json block
+            fence = _JSON_FENCE_RE.search(response)
+            if fence:
+                try:
+                    return _json_loads(fence.group(1)).get('changes', [])
+                except (json.JSONDecodeError, ValueError):
+                    pass
+
+            # Otherwise scan from each '{' with an incremental decoder, so
+            # stray braces in surrounding prose don't break the parse
+            parsed = None
+            for i, ch in enumerate(response):
+                if ch == '{':
+                    try:
+                        parsed, _ = _JSON_DECODER.raw_decode(response, i)
+                        break
+                    except json.JSONDecodeError:
+                        continue
+
+            if parsed is None:
                 raise ValueError("No JSON found in response")
-            
-            json_str = response[start_idx:end_idx]
-            parsed = json.loads(json_str)
-            
+
             return parsed.get('changes', [])
-            
+
         except (json.JSONDecodeError, ValueError) as e:
             # Fallback: try to extract changes manually
             print(f"Warning: Could not parse JSON response: {e}")
@@ -262,9 +481,8 @@ Generate practical, working code that implements the requested feature.
                 try:
                     existing_path = Path(repo_path) / file_path
                     if existing_path.exists():
-                        async with aiofiles.open(existing_path, 'r') as f:
-                            original_content = await f.read()
-                        
+                        original_content = await _read_text(existing_path)
+
                         # Simple diff preview (first 200 chars of change)
                         new_content = change.get('content', '')
                         if original_content != new_content:
@@ -278,18 +496,47 @@ Generate practical, working code that implements the requested feature.
         
         return validated_changes
     
-    async def _query_ai(self, prompt: str, system_message: str = None) -> str:
+    def _cache_key(self, prompt: str, system_message: str = None, context: str = None) -> str:
+        """Build a stable cache key from the model, system message and prompt"""
+        raw = f"{self.model}\0{system_message}\0{context}\0{prompt}".encode('utf-8')
+        return hashlib.sha256(raw).hexdigest()
+
+    async def _query_ai(self, prompt: str, system_message: str = None, context: str = None) -> str:
+        """Query the AI model (Ollama or OpenAI), with response caching"""
+
+        key = self._cache_key(prompt, system_message, context)
+        cached = self._resp_cache.get(key)
+        if cached is not None:
+            return cached
+
+        # Per-key lock collapses duplicate in-flight requests (single-flight)
+        lock = self._inflight_locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            cached = self._resp_cache.get(key)
+            if cached is not None:
+                return cached
+
+            result = await self._batcher.submit(prompt, system_message, context)
+            self._resp_cache[key] = result
+            self._inflight_locks.pop(key, None)
+            return result
+
+    async def _query_ai_uncached(self, prompt: str, system_message: str = None, context: str = None) -> str:
         """Query the AI model (Ollama or OpenAI)"""
-        
+
         # Try OpenAI first if available
         if self.openai_client and self.model.startswith('gpt'):
             try:
                 messages = []
                 if system_message:
                     messages.append({"role": "system", "content": system_message})
+                # The stable repo context goes in its own message so the
+                # provider can hash it identically across calls
+                if context:
+                    messages.append({"role": "user", "content": context})
                 messages.append({"role": "user", "content": prompt})
                 
-                response = self.openai_client.chat.completions.create(
+                response = await self.openai_client.chat.completions.create(
                     model=self.model,
                     messages=messages,
                     max_tokens=4000,
@@ -303,39 +550,52 @@ Generate practical, working code that implements the requested feature.
         
         # Use Ollama for local models
         try:
-            return await self._query_ollama(prompt, system_message)
+            return await self._query_ollama(prompt, system_message, context)
         except Exception as e:
             raise Exception(f"Failed to query AI model: {str(e)}")
-    
-    async def _query_ollama(self, prompt: str, system_message: str = None) -> str:
+
+    async def _query_ollama(self, prompt: str, system_message: str = None, context: str = None) -> str:
         """Query Ollama API"""
-        
-        full_prompt = prompt
-        if system_message:
-            full_prompt = f"{system_message}\\n\\n{prompt}"
+
+        # Stable prefix first (system + repo context), variable prompt last
+        parts = [p for p in (system_message, context, prompt) if p]
+        full_prompt = "\\n\\n".join(parts)
         
         payload = {
             "model": self.model,
             "prompt": full_prompt,
-            "stream": False,
+            "stream": True,
             "options": {
                 "temperature": 0.1,
                 "top_p": 0.9,
                 "num_predict": 4000
             }
         }
-        
+
         try:
-            # Use asyncio for the HTTP request
-            import httpx
-            async with httpx.AsyncClient(timeout=120.0) as client:
-                response = await client.post(
-                    f"{self.ollama_base_url}/api/generate",
-                    json=payload
-                )
+            client = self._get_http_client()
+            chunks = []
+            # Stream tokens as they are generated instead of buffering the
+            # full 4000-token response before returning anything
+            async with client.stream(
+                'POST',
+                f"{self.ollama_base_url}/api/generate",
+                json=payload
+            ) as response:
                 response.raise_for_status()
-                result = response.json()
-                return result.get('response', '')
-                
+                async for line in response.aiter_lines():
+                    if not line:
+                        continue
+                    data = _json_loads(line)
+                    token = data.get('response', '')
+                    if token:
+                        chunks.append(token)
+                        if self.on_token:
+                            self.on_token(token)
+                    if data.get('done'):
+                        break
+
+            return ''.join(chunks)
+
         except Exception as e:
             raise Exception(f"Ollama API error: {str(e)}")
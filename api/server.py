@@ -5,15 +5,27 @@ Provides real-time streaming updates for the CLI
 
 import asyncio
 import json
+import sys
 import uuid
-from typing import Dict, Any, Set
+from typing import Dict, Any, List, Set
 from datetime import datetime
-from fastapi import FastAPI, BackgroundTasks
+from fastapi import FastAPI
 from fastapi.responses import StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 import uvicorn
 
+# orjson is ~3-10x faster than stdlib json for the per-frame dumps on the
+# SSE hot path; fall back to stdlib when it isn't installed
+try:
+    import orjson
+
+    def _json_dumps(obj) -> str:
+        return orjson.dumps(obj).decode()
+except ImportError:
+    def _json_dumps(obj) -> str:
+        return json.dumps(obj)
+
 app = FastAPI(title="Backspace CLI SSE Server", version="1.0.0")
 
 # Enable CORS for local development
@@ -25,9 +37,38 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Global state management
-active_sessions: Dict[str, Dict[str, Any]] = {}
-session_queues: Dict[str, asyncio.Queue] = {}
+# Global state management, sharded 16 ways so burst creates/deletes don't
+# all contend on (and resize) a single dict; each session hashes straight
+# to one shard holding its metadata, queue and close event
+NUM_SHARDS = 16
+_session_shards: List[Dict[str, Any]] = [
+    {"sessions": {}, "queues": {}, "closed": {}, "lock": asyncio.Lock()}
+    for _ in range(NUM_SHARDS)
+]
+
+def _shard(session_id: str) -> Dict[str, Any]:
+    """Return the shard owning this session's state"""
+    return _session_shards[hash(session_id) & (NUM_SHARDS - 1)]
+
+# Cap per-session queue memory; slow consumers shed these message types
+# first while command results and errors are always delivered
+SESSION_QUEUE_MAXSIZE = 1024
+DROPPABLE_MESSAGE_TYPES = frozenset({"progress", "heartbeat", "status"})
+
+# Coarse-grained timestamp cache: one datetime.now().isoformat() per 100ms
+# instead of one per message, refreshed by a background clock task
+_NOW_ISO = datetime.now().isoformat()
+
+async def _clock_tick():
+    """Refresh the cached ISO timestamp every 100ms"""
+    global _NOW_ISO
+    while True:
+        _NOW_ISO = datetime.now().isoformat()
+        await asyncio.sleep(0.1)
+
+@app.on_event("startup")
+async def _start_clock():
+    asyncio.create_task(_clock_tick())
 
 class SessionCreate(BaseModel):
     """Model for session creation"""
@@ -43,42 +84,66 @@ class SSEMessage(BaseModel):
     """Model for SSE messages"""
     type: str
     data: Dict[str, Any]
-    timestamp: datetime = None
-    
+    timestamp: str = None
+
     def __init__(self, **data):
         if 'timestamp' not in data:
-            data['timestamp'] = datetime.now()
+            data['timestamp'] = _NOW_ISO
         super().__init__(**data)
 
 @app.post("/sessions")
 async def create_session(session_data: SessionCreate = None):
     """Create a new SSE session"""
     session_id = str(uuid.uuid4())
-    
-    active_sessions[session_id] = {
-        "created_at": datetime.now(),
-        "name": session_data.name if session_data else "default",
-        "metadata": session_data.metadata if session_data else {},
-        "status": "active"
-    }
-    
-    # Create message queue for this session
-    session_queues[session_id] = asyncio.Queue()
-    
+
+    shard = _shard(session_id)
+    async with shard["lock"]:
+        shard["sessions"][session_id] = {
+            "created_at": datetime.now(),
+            "name": session_data.name if session_data else "default",
+            "metadata": session_data.metadata if session_data else {},
+            "status": "active",
+            "tasks": set()
+        }
+
+        # Create message queue for this session (bounded so a slow consumer
+        # can't accumulate messages forever)
+        shard["queues"][session_id] = asyncio.Queue(maxsize=SESSION_QUEUE_MAXSIZE)
+        shard["closed"][session_id] = asyncio.Event()
+
     return {"session_id": session_id, "status": "created"}
 
 @app.delete("/sessions/{session_id}")
 async def close_session(session_id: str):
     """Close an SSE session"""
-    if session_id in active_sessions:
-        active_sessions[session_id]["status"] = "closed"
-        
-        # Send close message to queue
-        if session_id in session_queues:
-            await session_queues[session_id].put(
-                SSEMessage(type="session_closed", data={"session_id": session_id})
-            )
-        
+    shard = _shard(session_id)
+    if session_id in shard["sessions"]:
+        async with shard["lock"]:
+            shard["sessions"][session_id]["status"] = "closed"
+
+        # Wake the event generator first so it exits even when the
+        # queue is full and nobody is draining it
+        closed = shard["closed"].get(session_id)
+        if closed is not None:
+            closed.set()
+
+        # Send close message to queue, best-effort: the event above
+        # already guarantees teardown, so a full queue just drops the
+        # notification instead of blocking the DELETE handler
+        queue = shard["queues"].get(session_id)
+        if queue is not None:
+            try:
+                queue.put_nowait(
+                    SSEMessage(type="session_closed", data={"session_id": session_id})
+                )
+            except asyncio.QueueFull:
+                pass
+
+        # Stop any commands still running for this session so they don't
+        # keep writing into a queue nobody reads
+        for task in list(shard["sessions"][session_id]["tasks"]):
+            task.cancel()
+
         return {"status": "closed"}
     
     return {"error": "Session not found"}, 404
@@ -86,51 +151,63 @@ async def close_session(session_id: str):
 @app.get("/events/{session_id}")
 async def stream_events(session_id: str):
     """Stream SSE events for a session"""
-    if session_id not in active_sessions:
+    shard = _shard(session_id)
+    if session_id not in shard["sessions"]:
         return {"error": "Session not found"}, 404
-    
+
     async def event_generator():
         try:
             # Send initial connection message
-            yield f"data: {json.dumps({'type': 'connected', 'data': {'session_id': session_id}})}\n\n"
-            
+            yield f"data: {_json_dumps({'type': 'connected', 'data': {'session_id': session_id}})}\n\n"
+
             # Get the queue for this session
-            queue = session_queues.get(session_id)
-            if not queue:
-                yield f"data: {json.dumps({'type': 'error', 'data': {'message': 'Session queue not found'}})}\n\n"
+            queue = shard["queues"].get(session_id)
+            closed = shard["closed"].get(session_id)
+            if not queue or closed is None:
+                yield f"data: {_json_dumps({'type': 'error', 'data': {'message': 'Session queue not found'}})}\n\n"
                 return
-            
-            # Stream messages from the queue
-            while active_sessions.get(session_id, {}).get("status") == "active":
-                try:
-                    # Wait for message with timeout
-                    message = await asyncio.wait_for(queue.get(), timeout=30.0)
-                    
+
+            # Stream messages from the queue until the close event fires,
+            # avoiding a dict lookup + allocation on every iteration
+            while not closed.is_set():
+                getter = asyncio.create_task(queue.get())
+                waiter = asyncio.create_task(closed.wait())
+                done, pending = await asyncio.wait(
+                    {getter, waiter},
+                    return_when=asyncio.FIRST_COMPLETED,
+                    timeout=30.0
+                )
+                for task in pending:
+                    task.cancel()
+
+                if getter in done:
+                    message = getter.result()
+
                     # Convert message to SSE format
                     message_data = {
                         "type": message.type,
                         "data": message.data,
-                        "timestamp": message.timestamp.isoformat()
+                        "timestamp": message.timestamp
                     }
-                    
-                    yield f"data: {json.dumps(message_data)}\n\n"
-                    
+
+                    yield f"data: {_json_dumps(message_data)}\n\n"
+
                     # Check if this is a close message
                     if message.type == "session_closed":
                         break
-                        
-                except asyncio.TimeoutError:
-                    # Send heartbeat
-                    yield f"data: {json.dumps({'type': 'heartbeat', 'data': {'timestamp': datetime.now().isoformat()}})}\n\n"
+                elif not done:
+                    # Timed out - send heartbeat
+                    yield f"data: {_json_dumps({'type': 'heartbeat', 'data': {'timestamp': _NOW_ISO}})}\n\n"
                     
         except Exception as e:
-            yield f"data: {json.dumps({'type': 'error', 'data': {'message': str(e)}})}\n\n"
+            yield f"data: {_json_dumps({'type': 'error', 'data': {'message': str(e)}})}\n\n"
         finally:
             # Cleanup
-            if session_id in session_queues:
-                del session_queues[session_id]
-            if session_id in active_sessions:
-                active_sessions[session_id]["status"] = "closed"
+            async with shard["lock"]:
+                shard["queues"].pop(session_id, None)
+                shard["closed"].pop(session_id, None)
+                if session_id in shard["sessions"]:
+                    shard["sessions"][session_id]["status"] = "closed"
     
     return StreamingResponse(
         event_generator(),
@@ -145,31 +222,39 @@ async def stream_events(session_id: str):
 @app.post("/events/{session_id}")
 async def send_event(session_id: str, message: SSEMessage):
     """Send an event to a specific session"""
-    if session_id not in active_sessions:
+    shard = _shard(session_id)
+    if session_id not in shard["sessions"]:
         return {"error": "Session not found"}, 404
-    
-    if session_id not in session_queues:
+
+    queue = shard["queues"].get(session_id)
+    if queue is None:
         return {"error": "Session queue not found"}, 404
-    
-    # Add message to queue
-    await session_queues[session_id].put(message)
-    
+
+    # Add message to queue without blocking the handler; a full queue
+    # means no consumer is draining this session, so tell the sender
+    # to back off instead of parking the request forever
+    try:
+        queue.put_nowait(message)
+    except asyncio.QueueFull:
+        return {"error": "Session queue full"}, 503
+
     return {"status": "sent"}
 
 @app.post("/command/{session_id}")
-async def handle_command(session_id: str, command_request: CommandRequest, background_tasks: BackgroundTasks):
+async def handle_command(session_id: str, command_request: CommandRequest):
     """Handle commands and trigger background processes"""
-    if session_id not in active_sessions:
+    session = _shard(session_id)["sessions"].get(session_id)
+    if session is None:
         return {"error": "Session not found"}, 404
-    
-    # Add command processing to background tasks
-    background_tasks.add_task(
-        process_command,
-        session_id,
-        command_request.command,
-        command_request.params
+
+    # Run the command as a supervised task tied to the session, so closing
+    # the session cancels it instead of letting it run unsupervised
+    task = asyncio.create_task(
+        process_command(session_id, command_request.command, command_request.params)
     )
-    
+    session["tasks"].add(task)
+    task.add_done_callback(session["tasks"].discard)
+
     return {"status": "command_received", "command": command_request.command}
 
 async def process_command(session_id: str, command: str, params: Dict[str, Any]):
@@ -330,9 +415,27 @@ async def handle_create_pr(session_id: str, params: Dict[str, Any]):
 
 async def send_message(session_id: str, message_type: str, data: Dict[str, Any]):
     """Helper function to send messages to a session"""
-    if session_id in session_queues:
-        message = SSEMessage(type=message_type, data=data)
-        await session_queues[session_id].put(message)
+    queue = _shard(session_id)["queues"].get(session_id)
+    if queue is None:
+        return
+
+    message = SSEMessage(type=message_type, data=data)
+    try:
+        queue.put_nowait(message)
+    except asyncio.QueueFull:
+        if message_type in DROPPABLE_MESSAGE_TYPES:
+            # Shed the oldest message to make room for the newest one
+            try:
+                queue.get_nowait()
+            except asyncio.QueueEmpty:
+                pass
+            try:
+                queue.put_nowait(message)
+            except asyncio.QueueFull:
+                pass
+        else:
+            # Critical messages (errors, completions) apply backpressure
+            await queue.put(message)
 
 @app.get("/sessions")
 async def list_sessions():
@@ -345,7 +448,8 @@ async def list_sessions():
                 "created_at": session_data["created_at"].isoformat(),
                 "name": session_data["name"]
             }
-            for sid, session_data in active_sessions.items()
+            for shard in _session_shards
+            for sid, session_data in shard["sessions"].items()
         ]
     }
 
@@ -354,15 +458,26 @@ async def health_check():
     """Health check endpoint"""
     return {
         "status": "healthy",
-        "active_sessions": len(active_sessions),
+        "active_sessions": sum(len(shard["sessions"]) for shard in _session_shards),
         "timestamp": datetime.now().isoformat()
     }
 
 if __name__ == "__main__":
+    # uvloop is a drop-in asyncio replacement that roughly doubles
+    # event-loop throughput for the SSE streaming path (not on Windows)
+    loop_impl = "auto"
+    if sys.platform != "win32":
+        try:
+            import uvloop  # noqa: F401
+            loop_impl = "uvloop"
+        except ImportError:
+            pass
+
     uvicorn.run(
         "server:app",
         host="0.0.0.0",
         port=8000,
         reload=True,
-        log_level="info"
+        log_level="info",
+        loop=loop_impl
     )
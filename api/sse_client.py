@@ -5,25 +5,172 @@ Handles streaming updates and communication with the FastAPI backend
 
 import asyncio
 import json
+import sys
+import time
 from typing import Dict, Any, Callable, Optional
 import httpx
 from rich.console import Console
 
+# orjson parses the payload bytes directly and is several times faster
+# than stdlib json on the per-frame hot path; fall back when missing
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+# msgspec decodes frames straight into a typed struct with one reused
+# decoder, skipping dict construction and per-key hash lookups on the
+# default-handler path; optional like orjson
+try:
+    import msgspec
+
+    class _SSEFrame(msgspec.Struct):
+        type: str = 'unknown'
+        data: dict = {}
+
+    _FRAME_DECODER = msgspec.json.Decoder(_SSEFrame)
+except ImportError:
+    _FRAME_DECODER = None
+
 console = Console()
 
+# Hot-path lines are buffered and flushed in batches straight to stdout,
+# amortizing write syscalls and Rich's internal lock under event bursts;
+# Rich stays in use for the cold status/error lines
+_out_buf: list = []
+_last_flush = time.monotonic()
+_deferred_flush: Optional[asyncio.Task] = None
+
+def _emit(line: str):
+    global _last_flush
+    _out_buf.append(line)
+    now = time.monotonic()
+    if len(_out_buf) >= 32 or now - _last_flush >= 0.05:
+        _flush_output()
+        _last_flush = now
+    else:
+        # Arm a one-shot deferred flush so a burst that stops short of
+        # the batch threshold still reaches the terminal within 50ms
+        # instead of sitting buffered until the next message
+        _schedule_flush()
+
+def _schedule_flush():
+    global _deferred_flush
+    if _deferred_flush is not None:
+        return
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        # No loop (e.g. teardown); the next _emit or explicit
+        # _flush_output call drains the buffer
+        return
+    _deferred_flush = loop.create_task(_flush_after())
+
+async def _flush_after():
+    """Drain the buffer after the 50ms coalescing window"""
+    global _deferred_flush, _last_flush
+    await asyncio.sleep(0.05)
+    _deferred_flush = None
+    _flush_output()
+    _last_flush = time.monotonic()
+
+def _flush_output():
+    if _out_buf:
+        sys.stdout.write("\n".join(_out_buf) + "\n")
+        sys.stdout.flush()
+        _out_buf.clear()
+
+# Per-type handlers dispatched via dict lookup instead of an elif chain,
+# keeping the per-message work to one hash probe + one call
+_STATUS_ICONS = {'success': '✅', 'error': '❌', 'info': 'ℹ️ ', 'warning': '⚠️ '}
+
+def _h_status(data, message):
+    status = data.get('status', 'unknown')
+    description = data.get('description', '')
+    _emit(f"{_STATUS_ICONS.get(status, '🔄')} {description}")
+
+def _h_progress(data, message):
+    step = data.get('step', '')
+    current = data.get('current', 0)
+    total = data.get('total', 0)
+
+    if total > 0:
+        percentage = (current / total) * 100
+        _emit(f"📊 {step}: {current}/{total} ({percentage:.1f}%)")
+    else:
+        _emit(f"🔄 {step}")
+
+def _h_code_change(data, message):
+    file_path = data.get('file_path', 'unknown')
+    action = data.get('action', 'modified')
+    _emit(f"📝 {action.title()}: {file_path}")
+
+def _h_git_operation(data, message):
+    operation = data.get('operation', 'unknown')
+    result = data.get('result', '')
+    _emit(f"🌿 Git {operation}: {result}")
+
+def _h_ai_response(data, message):
+    model = data.get('model', 'unknown')
+    tokens = data.get('tokens', 0)
+    _emit(f"🤖 AI Response from {model} ({tokens} tokens)")
+
+def _h_error(data, message):
+    error_msg = data.get('message', 'Unknown error')
+    details = data.get('details', '')
+    _flush_output()
+    console.print(f"❌ Error: {error_msg}", markup=False, highlight=False, emoji=False)
+    if details:
+        console.print(f"   Details: {details}", markup=False, highlight=False, emoji=False)
+
+def _h_fallback(data, message):
+    # Fallback for unknown message types; drain the buffer first so
+    # this line doesn't render ahead of earlier buffered output
+    _flush_output()
+    console.print(f"📨 {message}", markup=False, highlight=False, emoji=False)
+
+_TYPE_HANDLERS = {
+    'status': _h_status,
+    'progress': _h_progress,
+    'code_change': _h_code_change,
+    'git_operation': _h_git_operation,
+    'ai_response': _h_ai_response,
+    'error': _h_error,
+}
+
 class SSEClient:
     def __init__(self, base_url: str = "http://localhost:8000"):
         self.base_url = base_url
-        self.client = None
+
+        # One long-lived client shared by the SSE stream and the REST
+        # calls, so commands reuse the pooled connection instead of paying
+        # a TCP/TLS handshake each; HTTP/2 lets them multiplex alongside
+        # the event stream
+        # read=None keeps quiet SSE streams alive indefinitely instead of
+        # tearing down and re-handshaking every 60s; the REST helpers pass
+        # their own per-request timeout
+        self.client = httpx.AsyncClient(
+            http2=True,
+            timeout=httpx.Timeout(connect=10.0, read=None, write=10.0, pool=10.0),
+            limits=httpx.Limits(max_keepalive_connections=32)
+        )
         self.is_connected = False
+
+        # Set as soon as the SSE response is established, so callers can
+        # wait exactly as long as the handshake takes
+        self._connected_event = asyncio.Event()
+
+        # Progress bursts are coalesced: only the latest update per step
+        # is printed, once per 50ms window
+        self._pending_progress: Dict[str, Dict[str, Any]] = {}
+        self._flush_task: Optional[asyncio.Task] = None
         
     async def connect(self, session_id: str, on_message: Callable[[Dict[str, Any]], None]):
         """
         Connect to the SSE endpoint and listen for messages
         """
         try:
-            self.client = httpx.AsyncClient(timeout=httpx.Timeout(60.0))
-            
             url = f"{self.base_url}/events/{session_id}"
             
             async with self.client.stream('GET', url) as response:
@@ -31,28 +178,63 @@ class SSEClient:
                     raise Exception(f"Failed to connect to SSE: {response.status_code}")
                 
                 self.is_connected = True
+                self._connected_event.set()
                 console.print(f"🔗 Connected to real-time updates (Session: {session_id})")
                 
-                # Process incoming messages
-                async for line in response.aiter_lines():
-                    if line.startswith('data: '):
+                # Process incoming messages: accumulate raw chunks and slice
+                # complete frames at the blank-line boundary, instead of
+                # paying a per-line decode + startswith for every field
+                buf = bytearray()
+                async for chunk in response.aiter_bytes(65536):
+                    buf.extend(chunk)
+                    while True:
+                        # Frames end at a blank line; accept LF and CRLF
+                        # delimiters per the SSE spec
+                        idx = buf.find(b'\n\n')
+                        ridx = buf.find(b'\r\n\r\n')
+                        if ridx != -1 and (idx == -1 or ridx < idx):
+                            frame = bytes(buf[:ridx])
+                            del buf[:ridx + 4]
+                        elif idx != -1:
+                            frame = bytes(buf[:idx])
+                            del buf[:idx + 2]
+                        else:
+                            break
+
+                        # Join multi-line data: fields; comment fields
+                        # (leading ':') and other field names are skipped
+                        payload = b'\n'.join(
+                            field.rstrip(b'\r')[5:].lstrip(b' ')
+                            for field in frame.split(b'\n')
+                            if field.startswith(b'data:')
+                        )
+                        if not payload:
+                            continue
+
                         try:
-                            data = json.loads(line[6:])  # Remove 'data: ' prefix
-                            await self._handle_message(data, on_message)
-                        except json.JSONDecodeError:
+                            if on_message is None and _FRAME_DECODER is not None:
+                                # Typed fast path: one reused decoder, no
+                                # intermediate dict for type/data access
+                                frame_msg = _FRAME_DECODER.decode(payload)
+                                self._dispatch_default(frame_msg.type, frame_msg.data, frame_msg)
+                            else:
+                                data = _json_loads(payload)
+                                await self._handle_message(data, on_message)
+                        except (json.JSONDecodeError, ValueError):
                             # Handle plain text messages
-                            await self._handle_message({'type': 'message', 'data': line[6:]}, on_message)
-                    elif line.startswith('event: '):
-                        # Handle event type (for future use)
-                        pass
+                            await self._handle_message(
+                                {'type': 'message', 'data': payload.decode('utf-8', 'replace')},
+                                on_message
+                            )
                         
         except Exception as e:
             console.print(f"❌ SSE connection error: {str(e)}")
-            raise e
+            raise
         finally:
+            # The shared client stays open for further commands; it is
+            # closed once in disconnect()
             self.is_connected = False
-            if self.client:
-                await self.client.aclose()
+            _flush_output()
     
     async def _handle_message(self, message: Dict[str, Any], callback: Callable[[Dict[str, Any]], None]):
         """Handle incoming SSE message"""
@@ -60,102 +242,68 @@ class SSEClient:
             if callback:
                 callback(message)
             else:
-                # Default message handler
-                self._default_message_handler(message)
-                
+                self._dispatch_default(
+                    message.get('type', 'unknown'), message.get('data', {}), message
+                )
+        except Exception as e:
+            console.print(f"❌ Error handling message: {str(e)}")
+
+    def _dispatch_default(self, msg_type, data, message):
+        """Route a decoded frame to the default per-type handlers"""
+        try:
+            if msg_type == 'progress':
+                # Coalesce rapid progress updates so the terminal renders at
+                # most one line per step per window instead of every event
+                self._pending_progress[data.get('step', '')] = data
+                if self._flush_task is None:
+                    self._flush_task = asyncio.create_task(self._flush_progress())
+            else:
+                _TYPE_HANDLERS.get(msg_type, _h_fallback)(data, message)
         except Exception as e:
             console.print(f"❌ Error handling message: {str(e)}")
+
+    async def _flush_progress(self):
+        """Print the latest coalesced progress update per step"""
+        await asyncio.sleep(0.05)
+        pending, self._pending_progress = self._pending_progress, {}
+        self._flush_task = None
+        for data in pending.values():
+            _h_progress(data, None)
+        _flush_output()
     
     def _default_message_handler(self, message: Dict[str, Any]):
         """Default message handler for SSE messages"""
         msg_type = message.get('type', 'unknown')
         data = message.get('data', {})
-        
-        if msg_type == 'status':
-            status = data.get('status', 'unknown')
-            description = data.get('description', '')
-            
-            if status == 'success':
-                console.print(f"✅ {description}")
-            elif status == 'error':
-                console.print(f"❌ {description}")
-            elif status == 'info':
-                console.print(f"ℹ️  {description}")
-            elif status == 'warning':
-                console.print(f"⚠️  {description}")
-            else:
-                console.print(f"🔄 {description}")
-                
-        elif msg_type == 'progress':
-            step = data.get('step', '')
-            current = data.get('current', 0)
-            total = data.get('total', 0)
-            
-            if total > 0:
-                percentage = (current / total) * 100
-                console.print(f"📊 {step}: {current}/{total} ({percentage:.1f}%)")
-            else:
-                console.print(f"🔄 {step}")
-                
-        elif msg_type == 'code_change':
-            file_path = data.get('file_path', 'unknown')
-            action = data.get('action', 'modified')
-            console.print(f"📝 {action.title()}: {file_path}")
-            
-        elif msg_type == 'git_operation':
-            operation = data.get('operation', 'unknown')
-            result = data.get('result', '')
-            console.print(f"🌿 Git {operation}: {result}")
-            
-        elif msg_type == 'ai_response':
-            model = data.get('model', 'unknown')
-            tokens = data.get('tokens', 0)
-            console.print(f"🤖 AI Response from {model} ({tokens} tokens)")
-            
-        elif msg_type == 'error':
-            error_msg = data.get('message', 'Unknown error')
-            details = data.get('details', '')
-            console.print(f"❌ Error: {error_msg}")
-            if details:
-                console.print(f"   Details: {details}")
-                
-        else:
-            # Fallback for unknown message types
-            console.print(f"📨 {message}")
+        _TYPE_HANDLERS.get(msg_type, _h_fallback)(data, message)
     
     async def send_command(self, session_id: str, command: str, params: Dict[str, Any] = None):
         """
         Send a command to the SSE server
         """
         try:
-            if not self.client:
-                self.client = httpx.AsyncClient(timeout=httpx.Timeout(30.0))
-            
             url = f"{self.base_url}/command/{session_id}"
             payload = {
                 "command": command,
                 "params": params or {}
             }
             
-            response = await self.client.post(url, json=payload)
+            response = await self.client.post(url, json=payload, timeout=30.0)
             response.raise_for_status()
             
             return response.json()
             
         except Exception as e:
             console.print(f"❌ Failed to send command: {str(e)}")
-            raise e
+            raise
     
     async def create_session(self) -> str:
         """
         Create a new SSE session
         """
         try:
-            if not self.client:
-                self.client = httpx.AsyncClient(timeout=httpx.Timeout(30.0))
-            
             url = f"{self.base_url}/sessions"
-            response = await self.client.post(url)
+            response = await self.client.post(url, timeout=30.0)
             response.raise_for_status()
             
             session_data = response.json()
@@ -168,7 +316,7 @@ class SSEClient:
             
         except Exception as e:
             console.print(f"❌ Failed to create session: {str(e)}")
-            raise e
+            raise
     
     async def close_session(self, session_id: str):
         """
@@ -179,7 +327,7 @@ class SSEClient:
                 return
             
             url = f"{self.base_url}/sessions/{session_id}"
-            await self.client.delete(url)
+            await self.client.delete(url, timeout=30.0)
             
         except Exception as e:
             console.print(f"⚠️  Warning: Failed to close session: {str(e)}")
@@ -189,6 +337,7 @@ class SSEClient:
         Disconnect from the SSE server
         """
         self.is_connected = False
+        _flush_output()
         if self.client:
             try:
                 await self.client.aclose()
@@ -210,20 +359,36 @@ async def run_with_sse_updates(session_id: str, process_func: Callable, *args, *
             sse_client.connect(session_id, None)  # Use default handler
         )
         
-        # Give SSE a moment to connect
-        await asyncio.sleep(0.5)
-        
+        # Wait until the stream is actually established rather than
+        # sleeping a fixed half second. If the connection attempt
+        # itself fails or nothing happens within 5s, run the workload
+        # anyway — a dead SSE server should cost the live updates, not
+        # the run
+        waiter = asyncio.create_task(sse_client._connected_event.wait())
+        done, _ = await asyncio.wait(
+            {waiter, sse_task},
+            timeout=5.0,
+            return_when=asyncio.FIRST_COMPLETED
+        )
+        if waiter in done:
+            waiter.result()
+        else:
+            waiter.cancel()
+            console.print("⚠️  Warning: SSE connection not established, continuing without live updates")
+
         # Run the main process
         result = await process_func(*args, **kwargs)
-        
-        # Cancel SSE task
-        sse_task.cancel()
-        
+
         return result
-        
-    except Exception as e:
-        raise e
+
     finally:
+        # Cancel the SSE task and wait for it to actually finish, so it
+        # isn't still using the client when we close it
+        sse_task.cancel()
+        try:
+            await sse_task
+        except (asyncio.CancelledError, Exception):
+            pass
         await sse_client.disconnect()
 
 def create_message_handler(progress_callback: Optional[Callable] = None):
@@ -242,16 +407,8 @@ def create_message_handler(progress_callback: Optional[Callable] = None):
             data = message.get('data', {})
             status = data.get('status', 'info')
             description = data.get('description', '')
-            
-            if status == 'success':
-                console.print(f"✅ {description}")
-            elif status == 'error':
-                console.print(f"❌ {description}")
-            elif status == 'warning':
-                console.print(f"⚠️  {description}")
-            else:
-                console.print(f"ℹ️  {description}")
-                
+            console.print(f"{_STATUS_ICONS.get(status, 'ℹ️ ')} {description}")
+
         elif msg_type == 'step_complete':
             data = message.get('data', {})
             step_name = data.get('step', 'Unknown step')
@@ -6,13 +6,24 @@ then uses AI to make code changes and create a pull request.
 """
 
 import os
+import re
 import sys
+import time
 import asyncio
 import click
 from rich.console import Console
 from rich.progress import Progress, SpinnerColumn, TextColumn
 from dotenv import load_dotenv
 
+# uvloop speeds up every async hot path here (SSE frames, httpx calls,
+# git subprocesses); silently keep the default loop when unavailable
+if sys.platform != 'win32':
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+
 # Load environment variables
 load_dotenv()
 
@@ -24,24 +35,51 @@ from api.sse_client import SSEClient
 
 console = Console()
 
+# Accepts https/http, git@ and bare github.com forms, with or without .git
+_REPO_RE = re.compile(r'github\.com[:/]([^/]+)/([^/\s]+?)(?:\.git)?/?$')
+
+# Prompt keyword categories checked via one tokenize + set intersection
+# instead of repeated substring scans over the prompt
+_FIX_WORDS = frozenset({'fix', 'bug', 'error', 'issue'})
+_ADD_WORDS = frozenset({'add', 'create', 'new', 'implement'})
+_UPDATE_WORDS = frozenset({'update', 'improve', 'enhance', 'refactor'})
+_TEST_WORDS = frozenset({'test', 'testing'})
+_DOC_WORDS = frozenset({'doc', 'readme', 'comment'})
+
+def _compute_repo_size(path: str) -> int:
+    """Total size in bytes of a checkout, using scandir so each entry's
+    cached stat data is reused instead of a second stat per file"""
+    total = 0
+    stack = [path]
+    while stack:
+        current = stack.pop()
+        try:
+            with os.scandir(current) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            # .git/objects is often half the bytes and
+                            # meaningless for user-facing size reporting
+                            if entry.name == 'objects' and current.endswith('.git'):
+                                continue
+                            stack.append(entry.path)
+                        elif entry.is_file(follow_symlinks=False):
+                            total += entry.stat(follow_symlinks=False).st_size
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+    return total
+
 def generate_concise_pr_title(prompt: str, changes: list) -> str:
     """Generate a concise PR title based on changes and prompt"""
     
     # Extract key actions from changes
-    actions = set()
     files_count = len(changes)
-    main_files = []
-    
-    for change in changes:
-        actions.add(change['action'])
-        file_path = change['file_path']
-        # Get just the filename for key files
-        if '/' in file_path:
-            filename = file_path.split('/')[-1]
-        else:
-            filename = file_path
-        main_files.append(filename)
-    
+    actions = {change['action'] for change in changes}
+    # Just the filename for key files
+    main_files = [change['file_path'].rsplit('/', 1)[-1] for change in changes]
+
     # Limit to 3 most important files
     if len(main_files) > 3:
         main_files = main_files[:2] + [f"and {len(main_files)-2} more"]
@@ -58,17 +96,18 @@ def generate_concise_pr_title(prompt: str, changes: list) -> str:
     else:
         action_text = "Fix"
     
-    # Generate short title based on prompt keywords
-    prompt_lower = prompt.lower()
-    if any(word in prompt_lower for word in ['fix', 'bug', 'error', 'issue']):
+    # Generate short title based on prompt keywords: tokenize once, then
+    # each category check is a set intersection
+    tokens = set(prompt.lower().split())
+    if tokens & _FIX_WORDS:
         category = "Fix"
-    elif any(word in prompt_lower for word in ['add', 'create', 'new', 'implement']):
+    elif tokens & _ADD_WORDS:
         category = "Add"
-    elif any(word in prompt_lower for word in ['update', 'improve', 'enhance', 'refactor']):
+    elif tokens & _UPDATE_WORDS:
         category = "Update"
-    elif any(word in prompt_lower for word in ['test', 'testing']):
+    elif tokens & _TEST_WORDS:
         category = "Test"
-    elif any(word in prompt_lower for word in ['doc', 'readme', 'comment']):
+    elif tokens & _DOC_WORDS:
         category = "Docs"
     else:
         category = action_text
@@ -142,14 +181,11 @@ def main(repo_url: str, prompt: str, model: str, branch: str, dry_run: bool):
         sys.exit(1)
     
     # Parse repository URL
-    try:
-        repo_parts = repo_url.replace('https://github.com/', '').split('/')
-        if len(repo_parts) < 2:
-            raise ValueError("Invalid repository URL format")
-        owner, repo_name = repo_parts[0], repo_parts[1]
-    except Exception as e:
+    match = _REPO_RE.search(repo_url)
+    if not match:
         console.print(f"❌ [red]Invalid repository URL: {repo_url}[/red]")
         sys.exit(1)
+    owner, repo_name = match.group(1), match.group(2)
     
     console.print(f"🚀 [bold blue]Backspace CLI - AI Coding Agent[/bold blue]")
     console.print(f"📂 Repository: {owner}/{repo_name}")
@@ -192,21 +228,23 @@ async def process_repository(repo_url: str, owner: str, repo_name: str,
         await progress_callback.on_clone_start(repo_url)
         try:
             repo_path = await sandbox.clone_repository(repo_url)
-            # Get repository size for display
-            import os
-            total_size = sum(os.path.getsize(os.path.join(dirpath, filename))
-                           for dirpath, dirnames, filenames in os.walk(repo_path)
-                           for filename in filenames)
-            size_mb = total_size / (1024 * 1024)
-            await progress_callback.on_clone_complete(repo_path, size_mb)
+
+            # Report the size from a background task: the walk is pure disk
+            # I/O and can overlap the model-bound analysis step
+            async def _report_clone_size():
+                size_mb = await asyncio.to_thread(_compute_repo_size, repo_path) / (1024 * 1024)
+                await progress_callback.on_clone_complete(repo_path, size_mb)
+
+            clone_report_task = asyncio.create_task(_report_clone_size())
         except Exception as e:
             await progress_callback.on_error("clone", str(e))
             raise e
-        
+
         # Step 2: Analyze codebase
         await progress_callback.on_analyze_start()
         try:
             analysis = await ai_agent.analyze_codebase(repo_path, prompt)
+            await clone_report_task
             file_count = len(analysis.get('structure', {}).get('files', []))
             analysis_summary = analysis.get('summary', 'Analysis complete')
             await progress_callback.on_analyze_complete(file_count, analysis_summary)
@@ -257,7 +295,7 @@ async def process_repository(repo_url: str, owner: str, repo_name: str,
         await progress_callback.on_commit_start(branch)
         try:
             if not branch:
-                branch = f"zen-code-{int(asyncio.get_event_loop().time())}"
+                branch = f"zen-code-{int(time.time())}"
             
             commit_sha = await github_manager.create_branch_and_commit(
                 repo_path, branch, f"🤖 ZEN CODE: {prompt}", changes
@@ -281,16 +319,26 @@ async def process_repository(repo_url: str, owner: str, repo_name: str,
         try:
             # Generate concise PR title
             pr_title = generate_concise_pr_title(prompt, changes)
-            
+
+            # Assemble the body as parts and join once
+            body_parts = [
+                "## AI-Generated Changes by ZEN CODE",
+                "",
+                f"**Original Request:** {prompt}",
+                "",
+                f"**AI Model:** {model}",
+                "",
+                "**Changes Made:**",
+            ]
+            body_parts.extend(
+                f"- {change['action'].title()}: `{change['file_path']}`" for change in changes
+            )
+            body_parts += ["", "---", "*Generated automatically by ZEN CODE✨*"]
+
             pr_url = await github_manager.create_pull_request(
                 branch=branch,
                 title=pr_title,
-                body=f"## AI-Generated Changes by ZEN CODE\n\n"
-                     f"**Original Request:** {prompt}\n\n"
-                     f"**AI Model:** {model}\n\n"
-                     f"**Changes Made:**\n" + 
-                     "\n".join([f"- {change['action'].title()}: `{change['file_path']}`" for change in changes]) +
-                     f"\n\n---\n*Generated automatically by ZEN CODE✨*"
+                body="\n".join(body_parts)
             )
             await progress_callback.on_pr_complete(pr_url)
         except Exception as e:
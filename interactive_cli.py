@@ -3,43 +3,243 @@ Interactive CLI interface for Backspace CLI
 Provides a chat-like experience with ASCII art and guided prompts
 """
 
+import itertools
 import os
+import re
+import string
 import sys
 import time
+from pathlib import Path
 from typing import Optional, Dict, Any
+from xml.sax.saxutils import escape as xml_escape
 from rich.console import Console
 from rich.prompt import Prompt, Confirm
 from rich.panel import Panel
 from rich.text import Text
-from rich.align import Align
 from rich.table import Table
-from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TaskProgressColumn
 import click
 
-console = Console()
+class BufferedConsole(Console):
+    """Console that batches whole sections into a single print
 
-def display_ascii_art():
-    """Display the ZEN CODE ASCII art"""
-    ascii_art = """
+    Each console.print pays Rich's full markup-parse and encode cost, so
+    multi-line intro blocks accumulate via write() and flush once through
+    writeln() instead of printing line by line.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._line_buffer = []
+
+    def write(self, fragment):
+        self._line_buffer.append(fragment)
+
+    def writeln(self, fragment=None, **kwargs):
+        if fragment is not None:
+            self._line_buffer.append(fragment)
+        buffered = "\n".join(str(f) for f in self._line_buffer)
+        self._line_buffer.clear()
+        super().print(buffered, **kwargs)
+
+console = BufferedConsole()
+
+# Static banner and menus are built once at import; re-entry into the
+# guided prompts reuses them instead of re-allocating per call
+_ASCII_ART = """
 ╔═══════════════════════════════════════════════════════════════════╗
 ║                                                                   ║
 ║   ███████╗███████╗███╗   ██╗     ██████╗ ██████╗ ██████╗ ███████╗
 ║   ╚══███╔╝██╔════╝████╗  ██║    ██╔════╝██╔═══██╗██╔══██╗██╔════╝
-║     ███╔╝ █████╗  ██╔██╗ ██║    ██║     ██║   ██║██║  ██║█████╗  
-║    ███╔╝  ██╔══╝  ██║╚██╗██║    ██║     ██║   ██║██║  ██║██╔══╝  
+║     ███╔╝ █████╗  ██╔██╗ ██║    ██║     ██║   ██║██║  ██║█████╗
+║    ███╔╝  ██╔══╝  ██║╚██╗██║    ██║     ██║   ██║██║  ██║██╔══╝
 ║   ███████╗███████╗██║ ╚████║    ╚██████╗╚██████╔╝██████╔╝███████╗
 ║   ╚══════╝╚══════╝╚═╝  ╚═══╝     ╚═════╝ ╚═════╝ ╚═════╝ ╚══════╝
 ╚═══════════════════════════════════════════════════════════════════╝
 """
-    
-    # Create a gradient effect for the ASCII art
-    art_text = Text(ascii_art)
-    art_text.stylize("bold cyan", 0, 200)
-    art_text.stylize("bold blue", 200, 400)
-    art_text.stylize("bold magenta", 400, 600)
-    
-    console.print(art_text)
-    console.print()
+
+# Gradient effect for the ASCII art, baked in as raw ANSI codes at the
+# same offsets the old stylize spans covered; the constant banner skips
+# Rich's span-merge machinery entirely on render
+_BANNER = (
+    "\x1b[1;36m" + _ASCII_ART[:200]
+    + "\x1b[1;34m" + _ASCII_ART[200:400]
+    + "\x1b[1;35m" + _ASCII_ART[400:600]
+    + "\x1b[0m" + _ASCII_ART[600:]
+)
+
+PROJECT_TYPES = [
+    "Web Application", "API/Backend", "Library/Package", "CLI Tool",
+    "Mobile App", "Data Science", "Machine Learning", "Other"
+]
+
+LANGUAGES = [
+    "Python", "JavaScript/TypeScript", "Java", "C#", "Go",
+    "Rust", "PHP", "Ruby", "Let AI decide"
+]
+
+# Language-specific guidelines
+LANGUAGE_GUIDELINES = {
+    "Python": [
+        "Follow PEP 8 style guidelines for clean and readable code.",
+        "Include type hints where applicable.",
+        "Add descriptive docstrings for functions and classes.",
+        "Use appropriate data structures and built-in functions."
+    ],
+    "JavaScript/TypeScript": [
+        "Use modern ES6+ syntax and features.",
+        "Follow TypeScript best practices if applicable.",
+        "Include proper error handling with try-catch blocks.",
+        "Use async/await for asynchronous operations."
+    ],
+    "Java": [
+        "Follow Java coding conventions and naming standards.",
+        "Use appropriate design patterns where beneficial.",
+        "Include proper exception handling mechanisms.",
+        "Write clean, object-oriented code with clear interfaces."
+    ],
+    "C#": [
+        "Follow C# coding standards and conventions.",
+        "Use LINQ where appropriate for data operations.",
+        "Include proper exception handling and logging.",
+        "Implement interfaces and abstract classes appropriately."
+    ],
+    "Go": [
+        "Follow Go conventions and idioms.",
+        "Use proper error handling with error values.",
+        "Keep code simple, readable, and efficient.",
+        "Use goroutines and channels for concurrency when needed."
+    ],
+    "Rust": [
+        "Follow Rust best practices and idioms.",
+        "Ensure memory safety with ownership and borrowing.",
+        "Use proper error handling with Result and Option types.",
+        "Write efficient, zero-cost abstractions."
+    ],
+    "PHP": [
+        "Follow PSR standards for code formatting and structure.",
+        "Use proper namespacing and autoloading.",
+        "Include comprehensive error handling and validation.",
+        "Follow modern PHP practices and avoid deprecated features."
+    ],
+    "Ruby": [
+        "Follow Ruby conventions and idiomatic patterns.",
+        "Use appropriate Ruby gems and standard library features.",
+        "Include proper error handling with rescue blocks.",
+        "Write clean, expressive code that reads like natural language."
+    ],
+    "Let AI decide": [
+        "Choose the most appropriate language for the task.",
+        "Follow the selected language's best practices and conventions.",
+        "Ensure code is clean, readable, and well-documented.",
+        "Use language-specific features effectively."
+    ]
+}
+
+PROJECT_GUIDELINES = {
+    "Web Application": [
+        "Consider responsive design and cross-browser compatibility.",
+        "Implement proper user authentication and authorization.",
+        "Focus on user experience and accessibility.",
+        "Ensure security best practices for web applications."
+    ],
+    "API/Backend": [
+        "Design RESTful APIs with proper HTTP status codes.",
+        "Implement authentication and rate limiting.",
+        "Include comprehensive API documentation.",
+        "Focus on scalability and performance optimization."
+    ],
+    "Library/Package": [
+        "Design clean, intuitive APIs for end users.",
+        "Include comprehensive documentation and examples.",
+        "Implement proper versioning and backward compatibility.",
+        "Add thorough testing and error handling."
+    ],
+    "CLI Tool": [
+        "Focus on user experience with clear help documentation.",
+        "Provide meaningful error messages and usage examples.",
+        "Ensure cross-platform compatibility.",
+        "Include proper command-line argument parsing."
+    ],
+    "Mobile App": [
+        "Follow mobile-specific design patterns and guidelines.",
+        "Optimize for performance and battery usage.",
+        "Consider offline functionality and data synchronization.",
+        "Implement proper navigation and user interface components."
+    ],
+    "Data Science": [
+        "Focus on data processing efficiency and accuracy.",
+        "Include data visualization and analysis components.",
+        "Follow scientific computing best practices.",
+        "Ensure reproducibility and proper data handling."
+    ],
+    "Machine Learning": [
+        "Implement proper model training and evaluation pipelines.",
+        "Include data preprocessing and feature engineering.",
+        "Follow MLOps best practices for model deployment.",
+        "Ensure model interpretability and performance monitoring."
+    ],
+    "Other": [
+        "Apply general software engineering best practices.",
+        "Focus on code maintainability and readability.",
+        "Include appropriate testing and documentation.",
+        "Consider scalability and performance implications."
+    ]
+}
+
+# Read once at import; the fallback expression in get_execution_options
+# then only runs when the env var is actually unset
+_DEFAULT_MODEL_ENV = os.environ.get('DEFAULT_MODEL')
+
+# One precompiled pattern accepts full URLs, github.com/user/repo, and
+# bare user/repo forms, with or without a .git suffix or trailing slash
+_GH_RE = re.compile(r'^(?:https?://)?(?:github\.com/)?([^/\s]+)/([^/\s]+?)(?:\.git)?/?$')
+
+# Branch-name helpers: the stop-word set and the cleanup translation
+# table are built once; str.translate strips non-alphanumerics in a
+# single C-level pass instead of re-compiling a regex per call
+_STOP_WORDS = frozenset({
+    'a', 'an', 'the', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for',
+    'of', 'with', 'by', 'is', 'are', 'was', 'were', 'be', 'been', 'being',
+    'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would', 'could',
+    'should', 'may', 'might', 'must', 'can', 'this', 'that', 'these', 'those'
+})
+_KEEP = frozenset(string.ascii_letters + string.digits)
+_CLEAN_TABLE = str.maketrans(
+    '', '', ''.join(chr(c) for c in range(128) if chr(c) not in _KEEP)
+)
+# Precompiled fallback for the rare word containing non-ASCII characters,
+# which the translation table above does not cover
+_NON_ALNUM_RE = re.compile(r'[^a-zA-Z0-9]')
+
+# The guideline lists never change at runtime, so their XML <Item>
+# blocks are rendered once at import; build_enhanced_prompt then only
+# does two dict lookups instead of a per-item join every call
+_LANG_XML = {
+    k: "".join(f"      <Item>{g}</Item>\n" for g in v)
+    for k, v in LANGUAGE_GUIDELINES.items()
+}
+_PROJ_XML = {
+    k: "".join(f"      <Item>{g}</Item>\n" for g in v)
+    for k, v in PROJECT_GUIDELINES.items()
+}
+
+def _build_choice_menu(items) -> Text:
+    """Build a numbered choice menu as one pre-parsed Text block
+
+    A Table routes every cell through Rich's styled-segment machinery;
+    a single Text renders the whole menu in one call.
+    """
+    return Text.from_markup(
+        "\n".join(f"[cyan]{i}[/cyan]  {item}" for i, item in enumerate(items, 1))
+    )
+
+_PROJECT_TYPE_MENU = _build_choice_menu(PROJECT_TYPES)
+_LANGUAGE_MENU = _build_choice_menu(LANGUAGES)
+
+def display_ascii_art():
+    """Display the ZEN CODE ASCII art"""
+    sys.stdout.write(_BANNER + "\n")
+    sys.stdout.flush()
 
 def display_welcome_message():
     """Display welcome message and instructions"""
@@ -59,9 +259,9 @@ def display_welcome_message():
 
 def get_repository_url() -> str:
     """Get repository URL with validation and suggestions"""
-    console.print("[bold blue]Step 1: Repository Selection[/bold blue]")
-    console.print("Enter the GitHub repository you'd like me to work with.")
-    console.print("[dim]Examples: https://github.com/user/repo or user/repo[/dim]\n")
+    console.write("[bold blue]Step 1: Repository Selection[/bold blue]")
+    console.write("Enter the GitHub repository you'd like me to work with.")
+    console.writeln("[dim]Examples: https://github.com/user/repo or user/repo[/dim]\n")
     
     while True:
         repo_url = Prompt.ask(
@@ -73,264 +273,128 @@ def get_repository_url() -> str:
         if not repo_url:
             console.print("[red]❌ Repository URL is required![/red]")
             continue
-            
-        # Auto-format repository URL
-        if not repo_url.startswith('https://'):
-            if '/' in repo_url and not repo_url.startswith('github.com'):
-                repo_url = f"https://github.com/{repo_url}"
-            elif not repo_url.startswith('github.com'):
+
+        # Normalize to a canonical URL with a single regex pass instead
+        # of a startswith/replace ladder
+        match = _GH_RE.match(repo_url.strip())
+        if not match:
+            if '://' in repo_url and 'github.com' not in repo_url:
+                console.print("[red]❌ Only GitHub repositories are supported currently[/red]")
+            else:
                 console.print("[red]❌ Invalid repository format. Please use: user/repo or full URL[/red]")
-                continue
-        
-        # Validate URL format
-        if 'github.com' not in repo_url:
-            console.print("[red]❌ Only GitHub repositories are supported currently[/red]")
             continue
-            
+
+        repo_url = f"https://github.com/{match.group(1)}/{match.group(2)}"
         console.print(f"[green]✅ Repository: {repo_url}[/green]\n")
         return repo_url
 
 def get_coding_prompt() -> Dict[str, Any]:
     """Get coding prompt with guided questions and suggestions"""
-    console.print("[bold blue]Step 2: Describe Your Vision[/bold blue]")
-    console.print("Tell me what you'd like me to build, fix, or improve.")
-    console.print("[dim]The more specific you are, the better results you'll get![/dim]\n")
-    
-    # Main prompt
-    main_prompt = Prompt.ask(
-        "[cyan]What would you like me to do?[/cyan]",
-        default="",
-        show_default=False
-    )
-    
-    if not main_prompt:
-        console.print("[red]❌ Please describe what you'd like me to do[/red]")
-        return get_coding_prompt()
+    # Retry on empty input or a rejected summary without recursing
+    while True:
+        console.write("[bold blue]Step 2: Describe Your Vision[/bold blue]")
+        console.write("Tell me what you'd like me to build, fix, or improve.")
+        console.writeln("[dim]The more specific you are, the better results you'll get![/dim]\n")
     
-    # Additional context questions
-    console.print("\n[bold blue]Let me gather some more details...[/bold blue]")
+        # Main prompt
+        main_prompt = Prompt.ask(
+            "[cyan]What would you like me to do?[/cyan]",
+            default="",
+            show_default=False
+        )
     
-    # Project type
-    project_types = [
-        "Web Application", "API/Backend", "Library/Package", "CLI Tool", 
-        "Mobile App", "Data Science", "Machine Learning", "Other"
-    ]
+        if not main_prompt:
+            console.print("[red]❌ Please describe what you'd like me to do[/red]")
+            continue
     
-    project_type_table = Table(title="", show_header=False)
-    for i, ptype in enumerate(project_types, 1):
-        project_type_table.add_row(f"[cyan]{i}[/cyan]", ptype)
+        # Additional context questions
+        console.print("\n[bold blue]Let me gather some more details...[/bold blue]")
     
-    console.print(project_type_table)
+        # Project type
+        console.print(_PROJECT_TYPE_MENU)
     
-    project_type_choice = Prompt.ask(
-        "What type of project is this? (1-8)",
-        choices=[str(i) for i in range(1, 9)],
-        default="8",
-        show_choices=False
-    )
-    
-    selected_project_type = project_types[int(project_type_choice) - 1]
+        project_type_choice = Prompt.ask(
+            "What type of project is this? (1-8)",
+            choices=[str(i) for i in range(1, 9)],
+            default="8",
+            show_choices=False
+        )
     
-    # Programming language preference
-    languages = [
-        "Python", "JavaScript/TypeScript", "Java", "C#", "Go", 
-        "Rust", "PHP", "Ruby", "Let AI decide"
-    ]
+        selected_project_type = PROJECT_TYPES[int(project_type_choice) - 1]
 
-    lang_table = Table(title="", show_header=False)
-    for i, lang in enumerate(languages, 1):
-        lang_table.add_row(f"[cyan]{i}[/cyan]", lang)
-    
-    console.print(lang_table)
-    
-    language_choice = Prompt.ask(
-        "Primary programming language? (1-9)",
-        choices=[str(i) for i in range(1, 10)],
-        default="9",
-        show_choices=False
-    )
+        # Programming language preference
+        console.print(_LANGUAGE_MENU)
+    
+        language_choice = Prompt.ask(
+            "Primary programming language? (1-9)",
+            choices=[str(i) for i in range(1, 10)],
+            default="9",
+            show_choices=False
+        )
     
-    selected_language = languages[int(language_choice) - 1]
+        selected_language = LANGUAGES[int(language_choice) - 1]
     
-    # Additional requirements
-    additional_requirements = Prompt.ask(
-        "[cyan]Any specific requirements or constraints?[/cyan]",
-        default="None"
-    )
+        # Additional requirements
+        additional_requirements = Prompt.ask(
+            "[cyan]Any specific requirements or constraints?[/cyan]",
+            default="None"
+        )
     
-    # Build enhanced prompt
-    enhanced_prompt = build_enhanced_prompt(
-        main_prompt, selected_project_type, selected_language, 
-        additional_requirements
-    )
+        # Build enhanced prompt
+        enhanced_prompt = build_enhanced_prompt(
+            main_prompt, selected_project_type, selected_language, 
+            additional_requirements
+        )
     
-    # Show summary
-    summary_panel = Panel(
-        f"[bold green]Task Summary[/bold green]\n\n"
-        f"[cyan]Main Request:[/cyan] {main_prompt}\n"
-        f"[cyan]Project Type:[/cyan] {selected_project_type}\n"
-        f"[cyan]Language:[/cyan] {selected_language}\n"
-        f"[cyan]Requirements:[/cyan] {additional_requirements}\n\n"
-        f"[yellow]Enhanced Prompt:[/yellow]\n{enhanced_prompt}",
-        title="Configuration",
-        border_style="green"
-    )
-    console.print(summary_panel)
+        # Show summary
+        summary_panel = Panel(
+            f"[bold green]Task Summary[/bold green]\n\n"
+            f"[cyan]Main Request:[/cyan] {main_prompt}\n"
+            f"[cyan]Project Type:[/cyan] {selected_project_type}\n"
+            f"[cyan]Language:[/cyan] {selected_language}\n"
+            f"[cyan]Requirements:[/cyan] {additional_requirements}\n\n"
+            f"[yellow]Enhanced Prompt:[/yellow]\n{enhanced_prompt}",
+            title="Configuration",
+            border_style="green"
+        )
+        console.print(summary_panel)
     
-    confirm = Confirm.ask("\n[bold]Does this look correct?[/bold]", default=True)
+        confirm = Confirm.ask("\n[bold]Does this look correct?[/bold]", default=True)
     
-    if not confirm:
-        console.print("[yellow]Let's try again...[/yellow]\n")
-        return get_coding_prompt()
+        if not confirm:
+            console.print("[yellow]Let's try again...[/yellow]\n")
+            continue
     
-    return {
-        "main_prompt": main_prompt,
-        "enhanced_prompt": enhanced_prompt,
-        "project_type": selected_project_type,
-        "language": selected_language,
-        "requirements": additional_requirements
-    }
+        return {
+            "main_prompt": main_prompt,
+            "enhanced_prompt": enhanced_prompt,
+            "project_type": selected_project_type,
+            "language": selected_language,
+            "requirements": additional_requirements
+        }
 
-def build_enhanced_prompt(main_prompt: str, project_type: str, language: str, 
-                         requirements: str) -> str:
-    """Build an enhanced prompt with XML context format"""
-    
-    # Language-specific guidelines
-    language_guidelines = {
-        "Python": [
-            "Follow PEP 8 style guidelines for clean and readable code.",
-            "Include type hints where applicable.",
-            "Add descriptive docstrings for functions and classes.",
-            "Use appropriate data structures and built-in functions."
-        ],
-        "JavaScript/TypeScript": [
-            "Use modern ES6+ syntax and features.",
-            "Follow TypeScript best practices if applicable.",
-            "Include proper error handling with try-catch blocks.",
-            "Use async/await for asynchronous operations."
-        ],
-        "Java": [
-            "Follow Java coding conventions and naming standards.",
-            "Use appropriate design patterns where beneficial.",
-            "Include proper exception handling mechanisms.",
-            "Write clean, object-oriented code with clear interfaces."
-        ],
-        "C#": [
-            "Follow C# coding standards and conventions.",
-            "Use LINQ where appropriate for data operations.",
-            "Include proper exception handling and logging.",
-            "Implement interfaces and abstract classes appropriately."
-        ],
-        "Go": [
-            "Follow Go conventions and idioms.",
-            "Use proper error handling with error values.",
-            "Keep code simple, readable, and efficient.",
-            "Use goroutines and channels for concurrency when needed."
-        ],
-        "Rust": [
-            "Follow Rust best practices and idioms.",
-            "Ensure memory safety with ownership and borrowing.",
-            "Use proper error handling with Result and Option types.",
-            "Write efficient, zero-cost abstractions."
-        ],
-        "PHP": [
-            "Follow PSR standards for code formatting and structure.",
-            "Use proper namespacing and autoloading.",
-            "Include comprehensive error handling and validation.",
-            "Follow modern PHP practices and avoid deprecated features."
-        ],
-        "Ruby": [
-            "Follow Ruby conventions and idiomatic patterns.",
-            "Use appropriate Ruby gems and standard library features.",
-            "Include proper error handling with rescue blocks.",
-            "Write clean, expressive code that reads like natural language."
-        ],
-        "Let AI decide": [
-            "Choose the most appropriate language for the task.",
-            "Follow the selected language's best practices and conventions.",
-            "Ensure code is clean, readable, and well-documented.",
-            "Use language-specific features effectively."
-        ]
-    }
-    
-    # Project-specific considerations
-    project_guidelines = {
-        "Web Application": [
-            "Consider responsive design and cross-browser compatibility.",
-            "Implement proper user authentication and authorization.",
-            "Focus on user experience and accessibility.",
-            "Ensure security best practices for web applications."
-        ],
-        "API/Backend": [
-            "Design RESTful APIs with proper HTTP status codes.",
-            "Implement authentication and rate limiting.",
-            "Include comprehensive API documentation.",
-            "Focus on scalability and performance optimization."
-        ],
-        "Library/Package": [
-            "Design clean, intuitive APIs for end users.",
-            "Include comprehensive documentation and examples.",
-            "Implement proper versioning and backward compatibility.",
-            "Add thorough testing and error handling."
-        ],
-        "CLI Tool": [
-            "Focus on user experience with clear help documentation.",
-            "Provide meaningful error messages and usage examples.",
-            "Ensure cross-platform compatibility.",
-            "Include proper command-line argument parsing."
-        ],
-        "Mobile App": [
-            "Follow mobile-specific design patterns and guidelines.",
-            "Optimize for performance and battery usage.",
-            "Consider offline functionality and data synchronization.",
-            "Implement proper navigation and user interface components."
-        ],
-        "Data Science": [
-            "Focus on data processing efficiency and accuracy.",
-            "Include data visualization and analysis components.",
-            "Follow scientific computing best practices.",
-            "Ensure reproducibility and proper data handling."
-        ],
-        "Machine Learning": [
-            "Implement proper model training and evaluation pipelines.",
-            "Include data preprocessing and feature engineering.",
-            "Follow MLOps best practices for model deployment.",
-            "Ensure model interpretability and performance monitoring."
-        ],
-        "Other": [
-            "Apply general software engineering best practices.",
-            "Focus on code maintainability and readability.",
-            "Include appropriate testing and documentation.",
-            "Consider scalability and performance implications."
-        ]
-    }
-    
-    # Get guidelines for the selected language and project type
-    lang_guides = language_guidelines.get(language, language_guidelines["Let AI decide"])
-    proj_guides = project_guidelines.get(project_type, project_guidelines["Other"])
-    
-    # Build the XML-formatted prompt
-    enhanced_prompt = f"""<Prompt>
+# The XML skeleton never changes: Template.substitute walks a token
+# list parsed once at import instead of rebuilding the string piecewise
+# on each call
+_PROMPT_TEMPLATE = string.Template("""<Prompt>
   <TaskSummary>
-    <MainRequest>{main_prompt}</MainRequest>
-    <ProjectType>{project_type}</ProjectType>
-    <Language>{language}</Language>
-    <Requirements>{requirements}</Requirements>
+    <MainRequest>${main_prompt}</MainRequest>
+    <ProjectType>${project_type}</ProjectType>
+    <Language>${language}</Language>
+    <Requirements>${requirements}</Requirements>
   </TaskSummary>
 
   <Context>
     <Description>
-      {main_prompt} Ensure the solution follows industry best practices and is production-ready.
+      ${main_prompt} Ensure the solution follows industry best practices and is production-ready.
     </Description>
   </Context>
 
   <Guidelines>
     <CodeQuality>
-""" + "\n".join([f"      <Item>{guide}</Item>" for guide in lang_guides]) + f"""
-    </CodeQuality>
+${lang_items}    </CodeQuality>
     <ProjectSpecific>
-""" + "\n".join([f"      <Item>{guide}</Item>" for guide in proj_guides]) + f"""
-    </ProjectSpecific>
+${proj_items}    </ProjectSpecific>
     <General>
       <Item>Ensure the code is immediately executable without modification.</Item>
       <Item>Include comprehensive error handling and input validation.</Item>
@@ -342,35 +406,42 @@ def build_enhanced_prompt(main_prompt: str, project_type: str, language: str,
 
   <ExpectedOutput>
     <Description>
-      Working {language.lower()} code for a {project_type.lower()} that implements: {main_prompt}
+      Working ${language_lower} code for a ${project_type_lower} that implements: ${main_prompt}
     </Description>
   </ExpectedOutput>
-</Prompt>"""
-    
-    return enhanced_prompt
+</Prompt>""")
+
+def build_enhanced_prompt(main_prompt: str, project_type: str, language: str,
+                         requirements: str) -> str:
+    """Build an enhanced prompt with XML context format"""
+    # Escape the user-supplied fields once so free-text input cannot
+    # break the XML structure
+    return _PROMPT_TEMPLATE.substitute(
+        main_prompt=xml_escape(main_prompt),
+        project_type=project_type,
+        language=language,
+        requirements=xml_escape(requirements),
+        lang_items=_LANG_XML.get(language, _LANG_XML["Let AI decide"]),
+        proj_items=_PROJ_XML.get(project_type, _PROJ_XML["Other"]),
+        language_lower=language.lower(),
+        project_type_lower=project_type.lower(),
+    )
+
+def _iter_clean_words(prompt: str):
+    """Yield cleaned, meaningful prompt tokens lazily"""
+    for word in prompt.lower().split():
+        if len(word) > 2 and word not in _STOP_WORDS:
+            clean_word = word.translate(_CLEAN_TABLE)
+            if not clean_word.isascii():
+                clean_word = _NON_ALNUM_RE.sub('', clean_word)
+            if clean_word:
+                yield clean_word
 
 def generate_branch_name(prompt: str) -> str:
     """Generate a branch name based on the user's request"""
-    import re
-    import time
-    
-    # Extract key words from the prompt
-    words = prompt.lower().split()
-    
-    # Filter out common words and keep meaningful ones
-    stop_words = {'a', 'an', 'the', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by', 'is', 'are', 'was', 'were', 'be', 'been', 'being', 'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would', 'could', 'should', 'may', 'might', 'must', 'can', 'this', 'that', 'these', 'those'}
-    
-    meaningful_words = [word for word in words if word not in stop_words and len(word) > 2]
-    
-    # Take first 2-3 most meaningful words
-    key_words = meaningful_words[:3] if len(meaningful_words) >= 3 else meaningful_words[:2]
-    
-    # Clean words for branch name (alphanumeric and hyphens only)
-    clean_words = []
-    for word in key_words:
-        clean_word = re.sub(r'[^a-zA-Z0-9]', '', word)
-        if clean_word:
-            clean_words.append(clean_word)
+    # Filter, slice, and clean in one pass: islice stops the scan as
+    # soon as the first 3 meaningful words are found
+    clean_words = list(itertools.islice(_iter_clean_words(prompt), 3))
     
     # Create base branch name
     if clean_words:
@@ -390,26 +461,45 @@ def generate_branch_name(prompt: str) -> str:
     
     return branch_name
 
+# Raw ANSI codes for throwaway status lines: no Rich markup parsing, and
+# stderr keeps them out of any piped stdout
+_DIM = "\x1b[2m"
+_RST = "\x1b[0m"
+
+# The parsed `ollama list` output is cached on disk briefly so repeated
+# CLI launches skip the subprocess spawn and its 10s timeout budget
+_MODELS_CACHE = Path.home() / '.cache' / 'zen-code' / 'models.json'
+_MODELS_TTL = 60  # seconds
+
 def get_available_models() -> list:
     """Get available models from Ollama only"""
     import subprocess
     import json
-    
+
+    # Fresh-enough cache: reuse it and skip the subprocess entirely
+    try:
+        if time.time() - _MODELS_CACHE.stat().st_mtime < _MODELS_TTL:
+            cached = json.loads(_MODELS_CACHE.read_text())
+            if cached:
+                return cached
+    except (OSError, ValueError):
+        pass
+
     available_models = []
-    
+
     try:
         # Try to get Ollama models
         result = subprocess.run(
-            ['ollama', 'list'], 
-            capture_output=True, 
-            text=True, 
+            ['ollama', 'list'],
+            capture_output=True,
+            text=True,
             timeout=10
         )
-        
+
         if result.returncode == 0:
-            lines = result.stdout.strip().split('\n')
-            # Skip header line and parse model names
-            for line in lines[1:]:  # Skip "NAME SIZE MODIFIED" header
+            lines = iter(result.stdout.strip().splitlines())
+            next(lines, None)  # Skip "NAME SIZE MODIFIED" header
+            for line in lines:
                 if line.strip():
                     # Extract model name (first column)
                     model_name = line.split()[0]
@@ -418,20 +508,30 @@ def get_available_models() -> list:
                     else:
                         # Add default tag if no tag specified
                         available_models.append(f"{model_name}:latest")
-        
+
         if available_models:
-            console.print(f"[dim]Found {len(available_models)} Ollama models[/dim]")
+            sys.stderr.write(f"{_DIM}Found {len(available_models)} Ollama models{_RST}\n")
         else:
-            console.print("[dim]No Ollama models found[/dim]")
-        
+            sys.stderr.write(f"{_DIM}No Ollama models found{_RST}\n")
+
     except (subprocess.TimeoutExpired, subprocess.CalledProcessError, FileNotFoundError):
-        console.print("[dim]Ollama not available or command failed[/dim]")
-    
+        sys.stderr.write(f"{_DIM}Ollama not available or command failed{_RST}\n")
+
     # If no models found, provide a default fallback
     if not available_models:
         available_models = ["codellama:7b"]
-        console.print("[dim]Using default fallback model[/dim]")
-    
+        sys.stderr.write(f"{_DIM}Using default fallback model{_RST}\n")
+
+    # Write the cache atomically so a concurrent launch never sees a
+    # partially written file
+    try:
+        _MODELS_CACHE.parent.mkdir(parents=True, exist_ok=True)
+        tmp = _MODELS_CACHE.with_suffix('.tmp')
+        tmp.write_text(json.dumps(available_models))
+        os.replace(tmp, _MODELS_CACHE)
+    except OSError:
+        pass
+
     return available_models
 
 def get_execution_options(prompt_data: Dict[str, Any]) -> Dict[str, Any]:
@@ -451,14 +551,15 @@ def get_execution_options(prompt_data: Dict[str, Any]) -> Dict[str, Any]:
     # Model selection - get available models dynamically
     console.print("\n[dim]Detecting available AI models...[/dim]")
     available_models = get_available_models()
-    default_model = os.getenv('DEFAULT_MODEL', available_models[0] if available_models else 'codellama:7b')
+    default_model = _DEFAULT_MODEL_ENV or (available_models[0] if available_models else 'codellama:7b')
 
-    model_table = Table(title="Available Models", show_header=False)
-    for i, model in enumerate(available_models, 1):
-        status = "(default)" if model == default_model else ""
-        model_table.add_row(f"[cyan]{i}[/cyan]", f"{model} [dim]{status}[/dim]")
-    
-    console.print(model_table)
+    model_menu = Text.from_markup(
+        "\n".join(
+            f"[cyan]{i}[/cyan]  {model} [dim]{'(default)' if model == default_model else ''}[/dim]"
+            for i, model in enumerate(available_models, 1)
+        )
+    )
+    console.print(model_menu)
     
     model_choice = Prompt.ask(
         f"Select AI model (1-{len(available_models)})",
@@ -501,8 +602,14 @@ def display_execution_summary(repo_url: str, prompt_data: Dict[str, Any], option
 def run_interactive_cli():
     """Main interactive CLI function"""
     try:
-        # Clear screen and display art
-        os.system('clear' if os.name == 'posix' else 'cls')
+        # Clear screen and display art: write the escape sequence
+        # directly instead of forking a shell plus clear/cls just to emit
+        # it; skip when output is piped
+        if sys.stdout.isatty():
+            if os.name == 'nt':
+                os.system("")  # Enable VT processing on Windows consoles
+            sys.stdout.write("\x1b[2J\x1b[H")
+            sys.stdout.flush()
         display_ascii_art()
         display_welcome_message()
         
@@ -514,54 +621,28 @@ def run_interactive_cli():
         # Display summary
         display_execution_summary(repo_url, prompt_data, options)
         
-        # Import and run the main CLI
+        # Import and run the main pipeline
         console.print("\n[bold green]Initializing ZEN CODE...[/bold green]\n")
-        
-        # Prepare arguments for the main CLI
-        cli_args = [
-            "--repo-url", repo_url,
-            "--prompt", prompt_data["enhanced_prompt"],
-            "--model", options["model"],
-            "--branch", options["branch"]
-        ]
-        
-        if options["dry_run"]:
-            cli_args.append("--dry-run")
-        
-        # Import the main CLI function
-        from cli import main as cli_main
-        
-        # Create a mock context for click
-        import click
-        with click.Context(cli_main) as ctx:
-            ctx.params = {
-                'repo_url': repo_url,
-                'prompt': prompt_data["enhanced_prompt"],
-                'model': options["model"],
-                'branch': options["branch"],
-                'dry_run': options["dry_run"]
-            }
-            
-            # Run the main CLI function
-            import asyncio
-            from cli import process_repository
-            
-            # Parse repo info
-            repo_parts = repo_url.replace('https://github.com/', '').split('/')
-            owner, repo_name = repo_parts[0], repo_parts[1]
-            
-            # Run the process
-            asyncio.run(process_repository(
-                repo_url=repo_url,
-                owner=owner,
-                repo_name=repo_name,
-                prompt=prompt_data["enhanced_prompt"],
-                model=options["model"],
-                branch=options["branch"],
-                dry_run=options["dry_run"],
-                validate_code=options.get("validate_code", True)
-            ))
-        
+
+        import asyncio
+        from cli import process_repository
+
+        # Parse repo info with the same pattern that normalized the
+        # URL in get_repository_url
+        owner, repo_name = _GH_RE.match(repo_url).group(1, 2)
+
+        # Run the process
+        asyncio.run(process_repository(
+            repo_url=repo_url,
+            owner=owner,
+            repo_name=repo_name,
+            prompt=prompt_data["enhanced_prompt"],
+            model=options["model"],
+            branch=options["branch"],
+            dry_run=options["dry_run"],
+            validate_code=options.get("validate_code", True)
+        ))
+
     except KeyboardInterrupt:
         console.print("\n\n[yellow]Thanks for using ZEN CODE! See you next time![/yellow]")
         sys.exit(0)
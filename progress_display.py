@@ -3,6 +3,7 @@ Enhanced progress visualization for ZEN CODE
 Provides beautiful progress bars, status updates, and real-time feedback
 """
 
+import sys
 import time
 import asyncio
 from typing import Dict, Any, List, Optional, Callable
@@ -16,10 +17,23 @@ from rich.text import Text
 from rich.table import Table
 from rich.live import Live
 from rich.align import Align
-import threading
 
 console = Console()
 
+# Icon/style per step status, looked up instead of re-branching through
+# an if/elif chain for every row of every refresh frame
+STATUS_META = {
+    "completed": ("✅", "green"),
+    "running": ("⚡", "yellow"),
+    "error": ("❌", "red"),
+    "pending": ("⏳", "dim"),
+}
+
+# Precomputed 20-char bar halves, sliced per frame instead of
+# re-multiplying the fill strings
+_BAR_F = "█" * 20
+_BAR_E = "░" * 20
+
 class ZenProgressTracker:
     """Advanced progress tracking with beautiful visualizations"""
     
@@ -33,37 +47,34 @@ class ZenProgressTracker:
             {"id": "push", "name": "Pushing to GitHub", "status": "pending"},
             {"id": "pr", "name": "Creating Pull Request", "status": "pending"}
         ]
+        # Index steps by id once so updates inside the live-render loop
+        # are one dict lookup instead of a list scan
+        self._by_id = {step["id"]: step for step in self.steps}
+        self._total = len(self.steps)
         self.current_step = 0
         self.details = {}
         self.start_time = time.time()
-        
+        # Set on every status change; the render loop only rebuilds the
+        # table when something actually changed
+        self._dirty = True
+        self._panel_cache = None
+
     def update_step_status(self, step_id: str, status: str, details: str = ""):
         """Update the status of a specific step"""
-        for step in self.steps:
-            if step["id"] == step_id:
-                step["status"] = status
-                if details:
-                    self.details[step_id] = details
-                break
+        step = self._by_id.get(step_id)
+        if step:
+            step["status"] = status
+            if details:
+                self.details[step_id] = details
+            self._dirty = True
     
     def get_progress_table(self) -> Table:
         """Generate a beautiful progress table"""
         table = Table(title="ZEN CODE Progress", show_header=False, box=None)
         
-        for i, step in enumerate(self.steps):
-            if step["status"] == "completed":
-                icon = "✅"
-                style = "green"
-            elif step["status"] == "running":
-                icon = "⚡"
-                style = "yellow"
-            elif step["status"] == "error":
-                icon = "❌"
-                style = "red"
-            else:
-                icon = "⏳"
-                style = "dim"
-            
+        for step in self.steps:
+            icon, style = STATUS_META.get(step["status"], STATUS_META["pending"])
+
             step_text = f"{icon} {step['name']}"
             
             # Add details if available
@@ -77,12 +88,19 @@ class ZenProgressTracker:
     
     def get_summary_panel(self) -> Panel:
         """Generate a summary panel with overall progress"""
-        completed = len([s for s in self.steps if s["status"] == "completed"])
-        total = len(self.steps)
+        completed = sum(1 for s in self.steps if s["status"] == "completed")
+        total = self._total
         elapsed = time.time() - self.start_time
-        
-        progress_bar = "█" * (completed * 20 // total) + "░" * (20 - (completed * 20 // total))
-        
+
+        # The panel only changes when a step completes or the elapsed
+        # second ticks over; reuse it between frames within that window
+        cache_key = (completed, int(elapsed))
+        if self._panel_cache is not None and self._panel_cache[0] == cache_key:
+            return self._panel_cache[1]
+
+        filled = completed * 20 // total
+        progress_bar = _BAR_F[:filled] + _BAR_E[:20 - filled]
+
         summary = f"""
 [bold cyan]Overall Progress:[/bold cyan] {completed}/{total} steps completed
 [bold cyan]Progress Bar:[/bold cyan] [{progress_bar}] {(completed/total)*100:.1f}%
@@ -90,56 +108,82 @@ class ZenProgressTracker:
 [bold cyan]Status:[/bold cyan] {'🎉 Complete!' if completed == total else '🔄 In Progress...'}
 """
         
-        return Panel(
+        panel = Panel(
             summary.strip(),
             title="📊 Execution Summary",
             border_style="bright_blue"
         )
+        self._panel_cache = (cache_key, panel)
+        return panel
+
+def _print_buffered(renderable):
+    """Render a panel once and flush it with a single stdout write
+
+    Rich's segment rendering issues many small write() calls per panel;
+    capturing the output first collapses them into one syscall.
+    """
+    with console.capture() as capture:
+        console.print(renderable)
+    sys.stdout.write(capture.get())
+    sys.stdout.flush()
 
 class AnimatedProgress:
     """Animated progress display with live updates"""
-    
+
     def __init__(self):
         self.tracker = ZenProgressTracker()
         self.live = None
         self.running = False
-    
+        self._update_event = None
+        self._render_task = None
+
     def start(self):
         """Start the animated progress display"""
         self.running = True
-        
-        def render_display():
-            table = self.tracker.get_progress_table()
-            return table
-        
-        # Use Live with simple table display
-        self.live = Live(render_display(), refresh_per_second=2, console=console)
+        self.live = Live(
+            self.tracker.get_progress_table(),
+            auto_refresh=False,
+            console=console
+        )
         self.live.start()
-        
-        # Start a background thread to update the display
-        def update_loop():
-            while self.running:
-                if self.live:
-                    try:
-                        self.live.update(self.tracker.get_progress_table())
-                    except Exception:
-                        pass  # Ignore update errors
-                time.sleep(0.5)
-        
-        self.update_thread = threading.Thread(target=update_loop, daemon=True)
-        self.update_thread.start()
-    
+
+        # The render task sleeps on an event and only redraws when a step
+        # actually changes; the progress callbacks all run on the same
+        # event loop, so no timer polling is needed
+        try:
+            self._update_event = asyncio.Event()
+            self._render_task = asyncio.ensure_future(self._render_loop())
+        except RuntimeError:
+            # No running loop (sync caller); the display stays static
+            self._update_event = None
+            self._render_task = None
+
+    async def _render_loop(self):
+        """Redraw the live table whenever an update is signalled"""
+        while self.running:
+            try:
+                await asyncio.wait_for(self._update_event.wait(), timeout=0.5)
+            except asyncio.TimeoutError:
+                continue
+            self._update_event.clear()
+            if self.live and self.tracker._dirty:
+                self.tracker._dirty = False
+                self.live.update(self.tracker.get_progress_table(), refresh=True)
+
     def stop(self):
         """Stop the animated progress display"""
         self.running = False
-        if hasattr(self, 'update_thread'):
-            self.update_thread.join(timeout=1.0)
+        if self._render_task is not None:
+            self._render_task.cancel()
+            self._render_task = None
         if self.live:
             self.live.stop()
-    
+
     def update_step(self, step_id: str, status: str, details: str = ""):
         """Update a step's status"""
         self.tracker.update_step_status(step_id, status, details)
+        if self._update_event is not None:
+            self._update_event.set()
 
 class EnhancedProgressCallback:
     """Enhanced progress callback for the main CLI"""
@@ -259,7 +303,7 @@ def create_celebration_display(pr_url: str):
         border_style="bright_green"
     )
     
-    console.print(success_panel)
+    _print_buffered(success_panel)
 
 def create_failure_display(validation_feedback: str):
     """Create a validation failure display"""
@@ -283,7 +327,7 @@ title="VALIDATION FAILURE",
 border_style="bright_red"
     )
     
-    console.print(Align.center(failure_panel))
+    _print_buffered(Align.center(failure_panel))
 
 def create_error_display(error_message: str):
     """Create an error display"""
@@ -301,7 +345,7 @@ def create_error_display(error_message: str):
         border_style="bright_red"
     )
     
-    console.print(Align.center(error_panel))
+    _print_buffered(Align.center(error_panel))
 
 # Export the main progress callback class
 __all__ = ['EnhancedProgressCallback', 'create_celebration_display', 'create_error_display', 'create_failure_display']
@@ -5,9 +5,67 @@ File system utilities for the Backspace CLI
 import os
 import shutil
 import tempfile
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
 from typing import List, Dict, Any, Optional
 from pathlib import Path
 
+try:
+    import fcntl
+    # FICLONE ioctl: reflink on filesystems that support it (btrfs/xfs)
+    _FICLONE = 0x40049409
+except ImportError:
+    fcntl = None
+
+def _fast_copy(src: str, dst: str):
+    """Copy src to dst in-kernel where the platform allows it
+
+    os.copy_file_range moves the bytes page-cache-to-page-cache without
+    bouncing them through userspace buffers; falls back to shutil.copy2
+    off Linux or on filesystems that refuse the syscall.
+    """
+    try:
+        with open(src, 'rb') as s, open(dst, 'wb') as d:
+            remaining = os.fstat(s.fileno()).st_size
+            while remaining > 0:
+                copied = os.copy_file_range(s.fileno(), d.fileno(), remaining)
+                if copied == 0:
+                    break
+                remaining -= copied
+        shutil.copystat(src, dst)
+    except (AttributeError, OSError):
+        shutil.copy2(src, dst)
+
+def _snapshot_file(src: str, dst: str):
+    """Snapshot src to dst without copying bytes where the OS allows it
+
+    Tries a reflink clone first (O(1), copy-on-write), then a hardlink
+    (O(1), shares the inode), and falls back to an in-kernel copy.
+    """
+    if fcntl is not None:
+        try:
+            with open(src, 'rb') as s, open(dst, 'wb') as d:
+                fcntl.ioctl(d.fileno(), _FICLONE, s.fileno())
+            shutil.copystat(src, dst)
+            return
+        except OSError:
+            # Filesystem doesn't support reflinks; drop the empty target
+            try:
+                os.remove(dst)
+            except OSError:
+                pass
+
+    try:
+        os.link(src, dst)
+    except FileExistsError:
+        # dst may be a placeholder the caller reserved; replace it
+        os.remove(dst)
+        try:
+            os.link(src, dst)
+        except OSError:
+            _fast_copy(src, dst)
+    except OSError:
+        _fast_copy(src, dst)
+
 def safe_file_read(file_path: str, max_size_mb: int = 10) -> str:
     """Safely read a file with size limits"""
     try:
@@ -67,74 +125,135 @@ def create_backup(file_path: str, backup_dir: Optional[str] = None) -> str:
         
         # Generate backup filename
         base_name = os.path.basename(file_path)
-        backup_name = f"{base_name}.backup"
-        backup_path = os.path.join(backup_dir, backup_name)
-        
-        # If backup already exists, add timestamp
-        if os.path.exists(backup_path):
+        backup_path = os.path.join(backup_dir, f"{base_name}.backup")
+
+        # Reserve the name atomically with O_EXCL: no exists() probe,
+        # and no window for a concurrent caller to claim the same name.
+        # On collision, retry once with a monotonic-ns suffix, which
+        # can't collide across rapid successive backups the way a
+        # 1-second timestamp could.
+        try:
+            fd = os.open(backup_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+            os.close(fd)
+        except FileExistsError:
             import time
-            timestamp = int(time.time())
-            backup_name = f"{base_name}.backup.{timestamp}"
-            backup_path = os.path.join(backup_dir, backup_name)
-        
-        # Copy file
-        shutil.copy2(file_path, backup_path)
-        
+            backup_path = os.path.join(
+                backup_dir, f"{base_name}.backup.{time.monotonic_ns()}"
+            )
+            fd = os.open(backup_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+            os.close(fd)
+
+        # Snapshot the file (reflink/hardlink where possible, copy otherwise)
+        _snapshot_file(file_path, backup_path)
+
         return backup_path
         
     except Exception as e:
         raise Exception(f"Failed to create backup: {str(e)}")
 
+def _scan_dir(current: str, depth: int, max_depth: Optional[int],
+              skip_hidden: bool):
+    """Scan one directory level, returning its files and subdirectories"""
+    files = []
+    subdirs = []
+    dirs_seen = 0
+    try:
+        entries = os.scandir(current)
+    except OSError:
+        return files, subdirs, dirs_seen
+    with entries:
+        for entry in entries:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    if skip_hidden and entry.name.startswith('.'):
+                        continue
+                    dirs_seen += 1
+                    if max_depth is None or depth + 1 < max_depth:
+                        subdirs.append((entry.path, depth + 1))
+                elif entry.is_file(follow_symlinks=False):
+                    files.append((
+                        entry.path, entry.name,
+                        entry.stat(follow_symlinks=False).st_size
+                    ))
+            except OSError:
+                # Skip entries that can't be accessed
+                continue
+    return files, subdirs, dirs_seen
+
+def scan_tree(directory: str, max_depth: Optional[int] = None,
+              skip_hidden: bool = True, workers: int = 1) -> Dict[str, Any]:
+    """Walk a directory once with os.scandir and collect every file
+
+    Returns {"files": [(path, name, size)], "dir_count": int}. Sizes come
+    from the DirEntry stat cache, so callers that need name, path, and
+    size avoid re-statting each entry with their own walk.
+
+    With workers > 1 each directory level is scanned on a thread pool;
+    the getdents/stat syscalls release the GIL, so sibling directories
+    scan concurrently on large trees.
+    """
+    files = []
+    dir_count = 0
+
+    if workers > 1:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            pending = {pool.submit(_scan_dir, directory, 0, max_depth, skip_hidden)}
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    level_files, subdirs, dirs_seen = future.result()
+                    files.extend(level_files)
+                    dir_count += dirs_seen
+                    for path, depth in subdirs:
+                        pending.add(pool.submit(
+                            _scan_dir, path, depth, max_depth, skip_hidden
+                        ))
+        return {"files": files, "dir_count": dir_count}
+
+    stack = [(directory, 0)]
+    while stack:
+        level_files, subdirs, dirs_seen = _scan_dir(
+            *stack.pop(), max_depth, skip_hidden
+        )
+        files.extend(level_files)
+        dir_count += dirs_seen
+        stack.extend(subdirs)
+
+    return {"files": files, "dir_count": dir_count}
+
 def get_directory_size(path: str) -> Dict[str, Any]:
     """Get the total size of a directory"""
     try:
-        total_size = 0
-        file_count = 0
-        dir_count = 0
-        
-        for dirpath, dirnames, filenames in os.walk(path):
-            dir_count += len(dirnames)
-            for filename in filenames:
-                file_path = os.path.join(dirpath, filename)
-                try:
-                    total_size += os.path.getsize(file_path)
-                    file_count += 1
-                except (OSError, FileNotFoundError):
-                    # Skip files that can't be accessed
-                    pass
-        
+        scan = scan_tree(path, skip_hidden=False, workers=8)
+        total_size = sum(size for _, _, size in scan["files"])
+
         return {
             "total_size": total_size,
             "total_size_mb": round(total_size / (1024 * 1024), 2),
-            "file_count": file_count,
-            "dir_count": dir_count
+            "file_count": len(scan["files"]),
+            "dir_count": scan["dir_count"]
         }
-        
+
     except Exception as e:
         return {"error": str(e)}
 
 def find_files_by_extension(directory: str, extensions: List[str], max_depth: int = 10) -> List[str]:
     """Find files by extension in a directory"""
     found_files = []
-    
+
     try:
-        for root, dirs, files in os.walk(directory):
-            # Limit depth
-            depth = root[len(directory):].count(os.sep)
-            if depth >= max_depth:
-                dirs[:] = []  # Don't go deeper
-                continue
-            
-            # Skip hidden directories
-            dirs[:] = [d for d in dirs if not d.startswith('.')]
-            
-            for file in files:
-                file_ext = os.path.splitext(file)[1].lower()
-                if file_ext in [ext.lower() for ext in extensions]:
-                    found_files.append(os.path.join(root, file))
-        
+        # Normalize once up front ('.py' and 'py' both accepted); the
+        # frozenset makes the per-file membership test O(1)
+        exts_set = frozenset(
+            ext.lower() if ext.startswith('.') else '.' + ext.lower()
+            for ext in extensions
+        )
+        for file_path, name, _ in scan_tree(directory, max_depth=max_depth)["files"]:
+            if os.path.splitext(name)[1].lower() in exts_set:
+                found_files.append(file_path)
+
         return found_files
-        
+
     except Exception as e:
         print(f"Error finding files: {str(e)}")
         return []
@@ -169,76 +288,84 @@ def ensure_directory_exists(directory: str) -> str:
     except Exception as e:
         raise Exception(f"Failed to create directory: {str(e)}")
 
+# Category tables for get_common_file_types, flipped once at import
+# into ext->category and name->category indexes so classifying a file
+# is one dict lookup instead of a scan over every category
+_FILE_CATEGORIES = {
+    "source_code": ['.py', '.js', '.ts', '.jsx', '.tsx', '.java', '.cpp', '.c', '.h', '.cs', '.php', '.rb', '.go', '.rs'],
+    "web": ['.html', '.css', '.scss', '.sass', '.less'],
+    "config": ['.json', '.yaml', '.yml', '.toml', '.ini', '.cfg', '.conf'],
+    "documentation": ['.md', '.txt', '.rst', '.tex'],
+    "images": ['.png', '.jpg', '.jpeg', '.gif', '.svg', '.ico'],
+    "data": ['.csv', '.json', '.xml', '.sql', '.db', '.sqlite'],
+    "build": ['.sh', '.bat', '.ps1', 'Dockerfile', 'Makefile'],
+    "other": []
+}
+
+_EXT_TO_CATEGORY: Dict[str, str] = {}
+_NAME_TO_CATEGORY: Dict[str, str] = {}
+for _category, _patterns in _FILE_CATEGORIES.items():
+    for _pattern in _patterns:
+        # setdefault keeps the first category that claims a pattern,
+        # matching the old scan order (e.g. .json stays "config")
+        if _pattern.startswith('.'):
+            _EXT_TO_CATEGORY.setdefault(_pattern, _category)
+        else:
+            _NAME_TO_CATEGORY.setdefault(_pattern, _category)
+
 def get_common_file_types(directory: str) -> Dict[str, List[str]]:
     """Categorize files by common types"""
-    categories = {
-        "source_code": ['.py', '.js', '.ts', '.jsx', '.tsx', '.java', '.cpp', '.c', '.h', '.cs', '.php', '.rb', '.go', '.rs'],
-        "web": ['.html', '.css', '.scss', '.sass', '.less'],
-        "config": ['.json', '.yaml', '.yml', '.toml', '.ini', '.cfg', '.conf'],
-        "documentation": ['.md', '.txt', '.rst', '.tex'],
-        "images": ['.png', '.jpg', '.jpeg', '.gif', '.svg', '.ico'],
-        "data": ['.csv', '.json', '.xml', '.sql', '.db', '.sqlite'],
-        "build": ['.sh', '.bat', '.ps1', 'Dockerfile', 'Makefile'],
-        "other": []
-    }
-    
-    result = {category: [] for category in categories.keys()}
-    
+    result = {category: [] for category in _FILE_CATEGORIES.keys()}
+
     try:
-        for root, dirs, files in os.walk(directory):
-            # Skip hidden directories
-            dirs[:] = [d for d in dirs if not d.startswith('.')]
-            
-            for file in files:
-                file_path = os.path.join(root, file)
-                file_ext = os.path.splitext(file)[1].lower()
-                
-                categorized = False
-                for category, extensions in categories.items():
-                    if category == "other":
-                        continue
-                    if file_ext in extensions or file in extensions:
-                        result[category].append(file_path)
-                        categorized = True
-                        break
-                
-                if not categorized:
-                    result["other"].append(file_path)
-        
+        for file_path, file, _ in scan_tree(directory)["files"]:
+            file_ext = os.path.splitext(file)[1].lower()
+            category = (_EXT_TO_CATEGORY.get(file_ext)
+                        or _NAME_TO_CATEGORY.get(file)
+                        or "other")
+            result[category].append(file_path)
+
         return result
-        
+
     except Exception as e:
         return {"error": str(e)}
 
+# Extensions treated as text without opening the file; built once at
+# module scope so the common extension-hit path is a single set lookup
+_TEXT_EXTENSIONS = frozenset({
+    '.txt', '.md', '.py', '.js', '.ts', '.html', '.css', '.scss', '.json',
+    '.yaml', '.yml', '.xml', '.csv', '.sql', '.sh', '.bat', '.ps1',
+    '.c', '.cpp', '.h', '.java', '.cs', '.php', '.rb', '.go', '.rs',
+    '.jsx', '.tsx', '.vue', '.svelte', '.toml', '.ini', '.cfg', '.conf'
+})
+
 def is_text_file(file_path: str) -> bool:
     """Check if a file is likely a text file"""
     try:
         # Check file extension first
-        text_extensions = {
-            '.txt', '.md', '.py', '.js', '.ts', '.html', '.css', '.scss', '.json', 
-            '.yaml', '.yml', '.xml', '.csv', '.sql', '.sh', '.bat', '.ps1', 
-            '.c', '.cpp', '.h', '.java', '.cs', '.php', '.rb', '.go', '.rs',
-            '.jsx', '.tsx', '.vue', '.svelte', '.toml', '.ini', '.cfg', '.conf'
-        }
-        
         ext = os.path.splitext(file_path)[1].lower()
-        if ext in text_extensions:
+        if ext in _TEXT_EXTENSIONS:
             return True
-        
-        # Try to read first few bytes
-        with open(file_path, 'rb') as f:
-            chunk = f.read(1024)
-            
-        # Check for null bytes (common in binary files)
-        if b'\\x00' in chunk:
+
+        # Sniff the first bytes through a raw fd, skipping the buffered
+        # file-object allocation of open()
+        fd = os.open(file_path, os.O_RDONLY | getattr(os, 'O_NONBLOCK', 0))
+        try:
+            chunk = os.read(fd, 512)
+        finally:
+            os.close(fd)
+
+        # Check for null bytes (common in binary files) before the
+        # decode attempt, so most binaries never pay for a decode
+        if b'\x00' in chunk:
             return False
-        
+
         # Try to decode as UTF-8
         try:
             chunk.decode('utf-8')
             return True
         except UnicodeDecodeError:
             return False
-            
+
     except Exception:
         return False
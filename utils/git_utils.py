@@ -3,32 +3,86 @@ Git utilities for repository operations
 """
 
 import os
+import re
 import subprocess
+from functools import cached_property, lru_cache
 from typing import List, Dict, Any
 from git import Repo
 import git
 
-def get_repo_info(repo_path: str) -> Dict[str, Any]:
-    """Get basic repository information"""
+@lru_cache(maxsize=32)
+def _open_repo(repo_path: str) -> Repo:
+    """Open a Repo handle once per path and reuse it
+
+    Repo construction spawns git subprocesses (rev-parse and friends),
+    so repeated calls against the same checkout share one handle.
+    """
+    return Repo(repo_path)
+
+class LazyRepoInfo:
+    """Repository metadata computed on first access
+
+    Every field costs at least one git subprocess and most callers read
+    only one or two of them, so each is a cached_property that runs git
+    the first time it is asked for. Dict-style access is supported so
+    the object drops in where the old eager dict was used.
+    """
+
+    is_repo = True
+
+    def __init__(self, repo: Repo):
+        self._repo = repo
+
+    @cached_property
+    def active_branch(self) -> str:
+        return str(self._repo.active_branch)
+
+    @cached_property
+    def is_dirty(self) -> bool:
+        return self._repo.is_dirty()
+
+    @cached_property
+    def untracked_files(self) -> List[str]:
+        return self._repo.untracked_files
+
+    @cached_property
+    def commit_count(self) -> int:
+        # rev-list --count gets one integer back from git instead of
+        # materializing a commit object per history entry
+        try:
+            return int(self._repo.git.rev_list('--count', 'HEAD'))
+        except git.exc.GitCommandError:
+            # Repo without any commits yet
+            return 0
+
+    @cached_property
+    def remotes(self) -> List[str]:
+        return [remote.name for remote in self._repo.remotes]
+
+    @cached_property
+    def remote_url(self):
+        repo_remotes = self._repo.remotes
+        return repo_remotes[0].url if repo_remotes else None
+
+    def __getitem__(self, key: str) -> Any:
+        return getattr(self, key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return getattr(self, key, default)
+
+    def as_dict(self, fields=("is_repo", "active_branch", "is_dirty",
+                              "untracked_files", "commit_count",
+                              "remotes", "remote_url")) -> Dict[str, Any]:
+        """Materialize a plain dict, computing only the requested fields"""
+        return {field: getattr(self, field) for field in fields}
+
+def get_repo_info(repo_path: str) -> Any:
+    """Get basic repository information, computed lazily per field"""
     try:
-        repo = Repo(repo_path)
-        
-        info = {
-            "is_repo": True,
-            "active_branch": str(repo.active_branch),
-            "is_dirty": repo.is_dirty(),
-            "untracked_files": repo.untracked_files,
-            "commit_count": len(list(repo.iter_commits())),
-            "remotes": [remote.name for remote in repo.remotes]
-        }
-        
-        # Get remote URL if available
-        if repo.remotes:
-            info["remote_url"] = repo.remotes[0].url
-        
-        return info
-        
-    except (git.exc.InvalidGitRepositoryError, git.exc.GitCommandError):
+        return LazyRepoInfo(_open_repo(repo_path))
+
+    except (git.exc.InvalidGitRepositoryError, git.exc.NoSuchPathError,
+            git.exc.GitCommandError):
         return {"is_repo": False, "error": "Not a valid git repository"}
 
 def create_gitignore(repo_path: str, template: str = "python"):
@@ -109,41 +163,70 @@ def create_gitignore(repo_path: str, template: str = "python"):
 def get_changed_files(repo_path: str) -> Dict[str, List[str]]:
     """Get lists of changed files by category"""
     try:
-        repo = Repo(repo_path)
-        
+        repo = _open_repo(repo_path)
+
+        # One porcelain status call replaces three diff invocations plus
+        # the untracked-files scan; -z gives unambiguous NUL-delimited
+        # paths with no quoting to undo
+        output = repo.git.status('--porcelain=v1', '-z', '--untracked-files=all')
+
+        modified: List[str] = []
+        staged: List[str] = []
+        untracked: List[str] = []
+        deleted: List[str] = []
+
+        entries = iter(output.split('\0'))
+        for entry in entries:
+            if len(entry) < 3:
+                continue
+            index_status, worktree_status = entry[0], entry[1]
+            path = entry[3:]
+
+            if index_status == 'R':
+                # Rename entries carry the original path as the next token
+                next(entries, None)
+
+            if index_status == '?':
+                untracked.append(path)
+                continue
+            if index_status != ' ':
+                staged.append(path)
+            if worktree_status != ' ':
+                modified.append(path)
+                if worktree_status == 'D':
+                    deleted.append(path)
+
         return {
-            "modified": [item.a_path for item in repo.index.diff(None)],
-            "staged": [item.a_path for item in repo.index.diff("HEAD")],
-            "untracked": repo.untracked_files,
-            "deleted": [item.a_path for item in repo.index.diff(None) if item.deleted_file]
+            "modified": modified,
+            "staged": staged,
+            "untracked": untracked,
+            "deleted": deleted
         }
-        
+
     except Exception as e:
         return {"error": str(e)}
 
+# Compiled once at import: a single alternation covers the https, ssh
+# and bare github.com URL shapes in one match instead of rebuilding and
+# trying three patterns per call
+_GH_URL = re.compile(
+    r"(?:https://github\.com/|git@github\.com:|github\.com/)"
+    r"([^/]+)/([^/]+?)(?:\.git)?/?$"
+)
+
 def validate_repo_url(url: str) -> Dict[str, Any]:
     """Validate and parse a GitHub repository URL"""
-    import re
-    
-    # Common GitHub URL patterns
-    patterns = [
-        r"https://github\.com/([^/]+)/([^/]+)/?(?:\.git)?$",
-        r"git@github\.com:([^/]+)/([^/]+)\.git$",
-        r"github\.com/([^/]+)/([^/]+)/?$"
-    ]
-    
-    for pattern in patterns:
-        match = re.match(pattern, url)
-        if match:
-            owner, repo = match.groups()
-            return {
-                "valid": True,
-                "owner": owner,
-                "repo": repo.replace('.git', ''),
-                "https_url": f"https://github.com/{owner}/{repo.replace('.git', '')}.git",
-                "ssh_url": f"git@github.com:{owner}/{repo.replace('.git', '')}.git"
-            }
-    
+    match = _GH_URL.match(url)
+    if match:
+        owner, repo = match.groups()
+        return {
+            "valid": True,
+            "owner": owner,
+            "repo": repo,
+            "https_url": f"https://github.com/{owner}/{repo}.git",
+            "ssh_url": f"git@github.com:{owner}/{repo}.git"
+        }
+
     return {
         "valid": False,
         "error": "Invalid GitHub repository URL format"
@@ -4,11 +4,62 @@ Handles GitHub API interactions, branch creation, and pull request management
 """
 
 import os
+import time
+import random
 import asyncio
-from typing import Dict, List, Any, Optional
+import itertools
+from typing import Dict, List, Any, Optional, Tuple
+import httpx
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from git import Repo
 import json
+import base64
+
+# Decode API responses with orjson when it is installed; its C parser
+# is several times faster than the stdlib on the large JSON bodies the
+# tree and listing endpoints return
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+# One async client shared by every GitHubManager in the process: a
+# single connection pool and DNS/TLS state regardless of how many
+# repos the orchestration touches. Auth travels per-request, so
+# managers with different tokens share the pool safely.
+_shared_client: Optional[httpx.AsyncClient] = None
+
+def _get_shared_client() -> httpx.AsyncClient:
+    """Create the module-wide async client on first use"""
+    global _shared_client
+    if _shared_client is None:
+        # HTTP/2 multiplexes every in-flight call over one TCP/TLS
+        # session, so gathered requests share a connection instead
+        # of each taking a pool slot
+        _shared_client = httpx.AsyncClient(
+            headers={
+                "Accept": "application/vnd.github.v3+json",
+                "Content-Type": "application/json",
+                # API payloads are JSON and compress well; brotli in
+                # particular shaves large listing responses
+                "Accept-Encoding": "gzip, deflate, br"
+            },
+            http2=True,
+            timeout=httpx.Timeout(10.0),
+            limits=httpx.Limits(max_keepalive_connections=20,
+                                max_connections=50)
+        )
+    return _shared_client
+
+async def shutdown_shared_client():
+    """Close the module-wide client; call once at process exit"""
+    global _shared_client
+    if _shared_client is not None:
+        await _shared_client.aclose()
+        _shared_client = None
 
 class GitHubManager:
     def __init__(self, owner: str, repo_name: str):
@@ -16,81 +67,331 @@ class GitHubManager:
         self.repo_name = repo_name
         self.github_token = os.getenv('GITHUB_TOKEN')
         self.base_url = "https://api.github.com"
-        
+        # Every endpoint hangs off this prefix; building it once keeps
+        # the hot-path f-strings short and the owner/repo interpolation
+        # out of every call
+        self._repo_base = f"{self.base_url}/repos/{owner}/{repo_name}"
+
         if not self.github_token or self.github_token == 'your_personal_access_token_here':
             raise Exception("GitHub token not configured. Please set GITHUB_TOKEN in .env file")
-        
+
         self.headers = {
             "Authorization": f"token {self.github_token}",
             "Accept": "application/vnd.github.v3+json",
-            "Content-Type": "application/json"
+            "Content-Type": "application/json",
+            "Accept-Encoding": "gzip, deflate, br"
         }
-    
-    async def create_branch_and_commit(self, repo_path: str, branch_name: str, 
+
+        # Optional token pool (GITHUB_TOKENS, comma-separated): each
+        # token has its own independent rate-limit bucket, so batch
+        # workloads scale with token count. With a single token the
+        # pool machinery stays out of the way entirely.
+        pool = os.getenv('GITHUB_TOKENS', '')
+        self._tokens = [t.strip() for t in pool.split(',') if t.strip()]
+        if not self._tokens:
+            self._tokens = [self.github_token]
+        self._tok_cycle = itertools.cycle(self._tokens)
+        # Tokens seen near exhaustion are parked until their reset time
+        self._token_resume: Dict[str, float] = {}
+
+        # Caps in-flight requests so a large gather can't trip GitHub's
+        # secondary rate limits; created lazily on the running loop
+        self._sem: Optional[asyncio.Semaphore] = None
+
+        # Short-lived response cache: repo metadata barely changes
+        # within one automation run, and every avoided call saves a
+        # round trip plus rate-limit budget
+        self._cache: Dict[str, Any] = {}
+
+        # Last (ETag, parsed body) per GET endpoint, for conditional
+        # requests: a 304 revalidation skips the body transfer and does
+        # not count against the rate limit
+        self._etags: Dict[str, Any] = {}
+
+        # Keep-alive session for the sync path: the TLS handshake
+        # dominates small HTTPS calls, and the pooled connection
+        # amortizes it across calls; retries absorb transient 5xx
+        self._sync_session = requests.Session()
+        self._sync_session.headers.update(self.headers)
+        self._sync_session.mount('https://', HTTPAdapter(
+            pool_connections=10,
+            pool_maxsize=20,
+            max_retries=Retry(total=3, backoff_factor=0.3,
+                              status_forcelist=[502, 503, 504])
+        ))
+
+    def close(self):
+        """Close the sync session and its pooled connections"""
+        self._sync_session.close()
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """Return the process-wide shared async client"""
+        return _get_shared_client()
+
+    def _next_headers(self) -> Dict[str, str]:
+        """Per-request auth header drawn round-robin from the token pool
+
+        The shared client carries no auth of its own, so every request
+        supplies its token here. Parked tokens are skipped until their
+        rate-limit window resets.
+        """
+        if len(self._tokens) == 1:
+            return {"Authorization": f"token {self.github_token}"}
+        now = time.time()
+        for _ in range(len(self._tokens)):
+            token = next(self._tok_cycle)
+            if self._token_resume.get(token, 0) <= now:
+                return {"Authorization": f"token {token}"}
+        # Every token is parked; let the next one take the 403
+        return {"Authorization": f"token {next(self._tok_cycle)}"}
+
+    async def _note_rate_limit(self, response: httpx.Response):
+        """Park a token until reset when its remaining budget runs low"""
+        if len(self._tokens) == 1:
+            return
+        remaining = response.headers.get('X-RateLimit-Remaining')
+        if remaining is None or int(remaining) >= 10:
+            return
+        auth = response.request.headers.get('Authorization', '')
+        token = auth.rpartition(' ')[2]
+        if token in self._tokens:
+            self._token_resume[token] = float(
+                response.headers.get('X-RateLimit-Reset', time.time() + 60)
+            )
+
+    async def _request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """Issue one API call through the concurrency gate
+
+        At most 10 requests are in flight at a time. Responses that are
+        rate-limited (403/429 carrying Retry-After or an exhausted
+        X-RateLimit-Remaining) are retried with exponential backoff and
+        jitter, waiting out the advertised reset when one is given; any
+        other response is returned to the caller as-is.
+        """
+        if self._sem is None:
+            self._sem = asyncio.Semaphore(10)
+
+        extra_headers = kwargs.pop('headers', None)
+        delay = 1.0
+        for attempt in range(4):
+            headers = self._next_headers()
+            if extra_headers:
+                headers.update(extra_headers)
+            kwargs['headers'] = headers
+
+            async with self._sem:
+                response = await self._get_client().request(method, url, **kwargs)
+
+            await self._note_rate_limit(response)
+
+            if response.status_code not in (403, 429):
+                return response
+
+            retry_after = response.headers.get('Retry-After')
+            remaining = response.headers.get('X-RateLimit-Remaining')
+            if retry_after is None and remaining != '0':
+                # A real 403, not a rate limit
+                return response
+            if attempt == 3:
+                return response
+
+            if retry_after is not None:
+                wait = float(retry_after)
+            elif response.headers.get('X-RateLimit-Reset'):
+                wait = max(0.0, float(response.headers['X-RateLimit-Reset']) - time.time())
+            else:
+                wait = delay
+            await asyncio.sleep(min(wait, 60.0) + random.uniform(0, 0.5))
+            delay *= 2
+
+        return response
+
+    async def _get_json(self, url: str, params: Optional[Dict[str, Any]] = None) -> Any:
+        """GET and parse a JSON endpoint with ETag revalidation
+
+        The ETag and parsed body of the last response per endpoint are
+        remembered and the next request sends If-None-Match; when the
+        resource is unchanged GitHub answers 304 with no body, the
+        stored result is served, and the call does not count against
+        the rate limit. Raises httpx.HTTPStatusError on error statuses.
+        """
+        key = url if not params else f"{url}?{sorted(params.items())}"
+        cached = self._etags.get(key)
+
+        headers = {"If-None-Match": cached[0]} if cached is not None else None
+        response = await self._request('GET', url, params=params, headers=headers)
+
+        if response.status_code == 304 and cached is not None:
+            return cached[1]
+        response.raise_for_status()
+
+        body = _json_loads(response.content)
+        etag = response.headers.get('ETag')
+        if etag:
+            self._etags[key] = (etag, body)
+        return body
+
+    async def aclose(self):
+        """Release this manager's async resources
+
+        The underlying client is shared by every manager in the
+        process, so it is deliberately left open here; call
+        shutdown_shared_client() once at process exit to close it.
+        """
+        pass
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.aclose()
+
+    async def create_branch_and_commit(self, repo_path: str, branch_name: str,
                                      commit_message: str, changes: List[Dict[str, Any]]) -> str:
         """
         Create a new branch, commit changes, and push to GitHub
+
+        The git work (checkouts, commit, and especially the network
+        push) is synchronous and can block for seconds, so the whole
+        sequence runs on a worker thread while the loop stays free for
+        PR creation and status updates.
         """
+        return await asyncio.to_thread(
+            self._do_branch_and_commit, repo_path, branch_name, commit_message
+        )
+
+    def _do_branch_and_commit(self, repo_path: str, branch_name: str,
+                              commit_message: str) -> str:
         try:
             repo = Repo(repo_path)
-            
-            # Ensure we're on the main/master branch
+
+            # _get_main_branch leaves HEAD on the branch it returns, so
+            # no second checkout is needed here
             main_branch = self._get_main_branch(repo)
-            repo.git.checkout(main_branch)
-            
+
             # Create and checkout new branch
             new_branch = repo.create_head(branch_name)
             repo.head.reference = new_branch
             repo.head.reset(index=True, working_tree=True)
-            
+
             print(f"Created branch: {branch_name}")
-            
+
             # Add all changes
             repo.git.add(A=True)
-            
-            # Check if there are changes to commit
-            if not repo.is_dirty() and not repo.untracked_files:
+
+            # Check if there are changes to commit. Everything was just
+            # staged, so diffing the index against HEAD is enough;
+            # is_dirty() would run two full git diffs to learn the same
+            staged = repo.index.diff(repo.head.commit) if repo.head.is_valid() else True
+            if not staged and not repo.untracked_files:
                 raise Exception("No changes to commit")
-            
+
             # Commit changes
             commit = repo.index.commit(commit_message)
             print(f"Committed changes: {commit.hexsha[:8]}")
-            
+
             # Push to GitHub
             origin = repo.remote('origin')
-            
+
             # Set up authentication for push
             repo_url_with_token = self._get_authenticated_url(repo)
             origin.set_url(repo_url_with_token)
-            
+
             # Push the new branch
             origin.push(refspec=f"{branch_name}:{branch_name}")
             print(f"Pushed branch {branch_name} to GitHub")
-            
+
             return commit.hexsha
-            
+
         except Exception as e:
             raise Exception(f"Failed to create branch and commit: {str(e)}")
-    
+
+    async def create_commit_via_api(self, branch: str, base_sha: str,
+                                    files: List[Dict[str, str]], message: str) -> str:
+        """Create a branch commit entirely over HTTP via the Git Data API
+
+        For small change sets this avoids forking git and the fresh TLS
+        handshake of a push: the blobs are uploaded concurrently on the
+        warm client, then one tree, one commit, and the branch ref are
+        created. files is a list of {"path": ..., "content": ...} dicts
+        and base_sha the commit the change builds on. Returns the new
+        commit SHA. The git-push path remains the right tool when
+        working from a dirty local checkout.
+        """
+        try:
+            async def _post_blob(content: str) -> str:
+                resp = await self._request('POST', f"{self._repo_base}/git/blobs",
+                                           json={"content": content,
+                                                 "encoding": "utf-8"})
+                resp.raise_for_status()
+                return _json_loads(resp.content)["sha"]
+
+            blob_shas = await asyncio.gather(
+                *[_post_blob(f["content"]) for f in files]
+            )
+
+            # The new tree builds on the base commit's tree, so files
+            # not in the change set carry over untouched
+            base_commit = await self._get_json(f"{self._repo_base}/git/commits/{base_sha}")
+            base_tree = base_commit["tree"]["sha"]
+
+            tree_entries = [
+                {"path": f["path"], "mode": "100644", "type": "blob", "sha": sha}
+                for f, sha in zip(files, blob_shas)
+            ]
+            resp = await self._request('POST', f"{self._repo_base}/git/trees",
+                                       json={"base_tree": base_tree,
+                                             "tree": tree_entries})
+            resp.raise_for_status()
+            tree_sha = _json_loads(resp.content)["sha"]
+
+            resp = await self._request('POST', f"{self._repo_base}/git/commits",
+                                       json={"message": message,
+                                             "tree": tree_sha,
+                                             "parents": [base_sha]})
+            resp.raise_for_status()
+            commit_sha = _json_loads(resp.content)["sha"]
+
+            resp = await self._request('POST', f"{self._repo_base}/git/refs",
+                                       json={"ref": f"refs/heads/{branch}",
+                                             "sha": commit_sha})
+            resp.raise_for_status()
+
+            print(f"Created commit via API: {commit_sha[:8]} on {branch}")
+            return commit_sha
+
+        except httpx.HTTPError as e:
+            raise Exception(f"Failed to create commit via API: {str(e)}")
+
     def _get_main_branch(self, repo: Repo) -> str:
-        """Determine the main branch name (main or master)"""
+        """Determine the main branch name and leave HEAD on it
+
+        The local heads are inspected directly instead of speculatively
+        checking branches out, so only the chosen branch costs a git
+        subprocess (the old approach forked twice on master-only repos).
+        """
+        names = {head.name for head in repo.heads}
+        for candidate in ('main', 'master'):
+            if candidate in names:
+                repo.git.checkout(candidate)
+                return candidate
+
         try:
-            # Try to checkout main first
-            try:
-                repo.git.checkout('main')
-                return 'main'
-            except:
-                repo.git.checkout('master')
-                return 'master'
+            # Neither conventional name exists locally: follow the
+            # remote's declared default (origin/HEAD -> origin/<branch>)
+            origin_head = repo.remotes.origin.refs['HEAD'].reference.name
+            branch = origin_head.rpartition('/')[2]
+            repo.git.checkout(branch)
+            return branch
         except Exception:
-            # If both fail, use the current branch
+            # If that fails too, use the current branch
             return str(repo.active_branch)
-    
+
     def _get_authenticated_url(self, repo: Repo) -> str:
         """Get repository URL with authentication token"""
         try:
             remote_url = repo.remote('origin').url
-            
+
             # Handle different URL formats
             if remote_url.startswith('https://github.com/'):
                 # Replace https://github.com/ with https://token@github.com/
@@ -102,73 +403,105 @@ class GitHubManager:
             else:
                 # Assume it's already an HTTPS URL, add token
                 return remote_url.replace('https://', f'https://{self.github_token}@')
-                
+
         except Exception as e:
             raise Exception(f"Failed to create authenticated URL: {str(e)}")
-    
-    async def create_pull_request(self, branch: str, title: str, body: str, 
+
+    async def create_pull_request(self, branch: str, title: str, body: str,
                                 base_branch: str = "main") -> str:
         """
         Create a pull request on GitHub
         """
         try:
-            # First try with 'main' as base, fallback to 'master'
-            pr_url = await self._try_create_pr(branch, title, body, base_branch)
+            # Ask the API for the real default branch first instead of
+            # speculatively trying 'main' and then 'master'
+            try:
+                repo_info = await self.get_repository_info()
+                first_base = repo_info["default_branch"]
+            except Exception:
+                first_base = base_branch
+
+            tried = [first_base]
+            pr_url, last_error = await self._try_create_pr(branch, title, body, first_base)
             if pr_url:
                 return pr_url
-            
-            # If main failed, try master
-            if base_branch == "main":
-                pr_url = await self._try_create_pr(branch, title, body, "master")
+
+            # Fall back to the conventional names we haven't tried yet,
+            # one at a time: PR creation is not idempotent, and firing
+            # the candidates concurrently could open a real PR against
+            # each valid base
+            candidates = dict.fromkeys(
+                b for b in (base_branch, "main", "master") if b != first_base
+            )
+            for candidate in candidates:
+                tried.append(candidate)
+                pr_url, last_error = await self._try_create_pr(branch, title, body, candidate)
                 if pr_url:
                     return pr_url
-            
-            raise Exception("Failed to create PR with both 'main' and 'master' as base branch")
-            
+
+            raise Exception(
+                f"Failed to create PR with base branches "
+                f"{', '.join(repr(b) for b in tried)}; last error: {last_error}"
+            )
+
         except Exception as e:
             raise Exception(f"Failed to create pull request: {str(e)}")
-    
-    async def _try_create_pr(self, branch: str, title: str, body: str, base_branch: str) -> Optional[str]:
-        """Try to create a PR with a specific base branch"""
+
+    async def _try_create_pr(self, branch: str, title: str, body: str,
+                             base_branch: str) -> Tuple[Optional[str], Optional[str]]:
+        """Try to create a PR with a specific base branch
+
+        Returns (pr_url, error); exactly one of the two is set, so the
+        caller can surface the last API error when every base fails.
+        """
         try:
-            url = f"{self.base_url}/repos/{self.owner}/{self.repo_name}/pulls"
-            
+            url = f"{self._repo_base}/pulls"
+
             data = {
                 "title": title,
                 "body": body,
                 "head": branch,
                 "base": base_branch
             }
-            
-            response = requests.post(url, headers=self.headers, json=data)
-            
+
+            response = await self._request('POST', url, json=data)
+
             if response.status_code == 201:
-                pr_data = response.json()
+                pr_data = _json_loads(response.content)
                 pr_url = pr_data['html_url']
                 print(f"Pull request created successfully: {pr_url}")
-                return pr_url
+                return pr_url, None
             elif response.status_code == 422:
                 # Unprocessable entity - might be wrong base branch
-                error_message = response.json().get('message', 'Unknown error')
+                error_message = _json_loads(response.content).get('message', 'Unknown error')
                 print(f"Failed to create PR with base '{base_branch}': {error_message}")
-                return None
+                return None, error_message
             else:
                 response.raise_for_status()
-                return None
-                
-        except requests.exceptions.RequestException as e:
+                return None, f"Unexpected status {response.status_code}"
+
+        except httpx.HTTPError as e:
             print(f"Request error when creating PR: {str(e)}")
-            return None
-    
+            return None, str(e)
+
+    async def _cached_get(self, key: str, ttl: float, fetch) -> Any:
+        """Return the cached value for key when fresh, else fetch and store"""
+        cached = self._cache.get(key)
+        now = time.monotonic()
+        if cached is not None and now - cached[0] < ttl:
+            return cached[1]
+        value = await fetch()
+        self._cache[key] = (now, value)
+        return value
+
     async def get_repository_info(self) -> Dict[str, Any]:
-        """Get repository information from GitHub API"""
+        """Get repository information from GitHub API (cached 5 min)"""
+        return await self._cached_get('repo_info', 300, self._fetch_repository_info)
+
+    async def _fetch_repository_info(self) -> Dict[str, Any]:
         try:
-            url = f"{self.base_url}/repos/{self.owner}/{self.repo_name}"
-            response = requests.get(url, headers=self.headers)
-            response.raise_for_status()
-            
-            repo_data = response.json()
-            
+            repo_data = await self._get_json(self._repo_base)
+
             return {
                 "name": repo_data["name"],
                 "full_name": repo_data["full_name"],
@@ -179,54 +512,63 @@ class GitHubManager:
                 "private": repo_data["private"],
                 "fork": repo_data["fork"]
             }
-            
-        except requests.exceptions.RequestException as e:
+
+        except httpx.HTTPError as e:
             raise Exception(f"Failed to get repository info: {str(e)}")
-    
+
     async def check_permissions(self) -> Dict[str, bool]:
-        """Check what permissions the token has on the repository"""
+        """Check what permissions the token has on the repository (cached 10 min)"""
+        return await self._cached_get('permissions', 600, self._fetch_permissions)
+
+    async def _fetch_permissions(self) -> Dict[str, bool]:
         try:
-            url = f"{self.base_url}/repos/{self.owner}/{self.repo_name}"
-            response = requests.get(url, headers=self.headers)
-            response.raise_for_status()
-            
-            repo_data = response.json()
+            repo_data = await self._get_json(self._repo_base)
             permissions = repo_data.get("permissions", {})
-            
+
             return {
                 "admin": permissions.get("admin", False),
                 "push": permissions.get("push", False),
                 "pull": permissions.get("pull", False)
             }
-            
-        except requests.exceptions.RequestException as e:
+
+        except httpx.HTTPError as e:
             raise Exception(f"Failed to check permissions: {str(e)}")
-    
+
     async def list_branches(self) -> List[str]:
-        """List all branches in the repository"""
+        """List all branches in the repository (cached 30s)"""
+        return await self._cached_get('branches', 30, self._fetch_branches)
+
+    async def _fetch_branches(self) -> List[str]:
         try:
-            url = f"{self.base_url}/repos/{self.owner}/{self.repo_name}/branches"
-            response = requests.get(url, headers=self.headers)
-            response.raise_for_status()
-            
-            branches_data = response.json()
-            return [branch["name"] for branch in branches_data]
-            
-        except requests.exceptions.RequestException as e:
+            url = f"{self._repo_base}/branches"
+
+            # Fetch full pages of 100 and follow the Link: rel="next"
+            # chain, instead of the server default of 30 per request
+            names: List[str] = []
+            params = {"per_page": 100}
+            while url:
+                response = await self._request('GET', url, params=params)
+                response.raise_for_status()
+                names.extend(branch["name"] for branch in _json_loads(response.content))
+                url = response.links.get('next', {}).get('url')
+                params = None  # the next link already carries its query
+
+            return names
+
+        except httpx.HTTPError as e:
             raise Exception(f"Failed to list branches: {str(e)}")
-    
+
     async def get_latest_commit(self, branch: str = None) -> Dict[str, Any]:
         """Get the latest commit from a branch"""
         try:
-            url = f"{self.base_url}/repos/{self.owner}/{self.repo_name}/commits"
-            params = {}
+            url = f"{self._repo_base}/commits"
+            # Only the newest commit is wanted, so ask for exactly one
+            # instead of the 30-entry default page
+            params = {"per_page": 1}
             if branch:
                 params["sha"] = branch
-            
-            response = requests.get(url, headers=self.headers, params=params)
-            response.raise_for_status()
-            
-            commits = response.json()
+
+            commits = await self._get_json(url, params=params)
             if commits:
                 latest = commits[0]
                 return {
@@ -237,85 +579,144 @@ class GitHubManager:
                 }
             else:
                 return {}
-                
-        except requests.exceptions.RequestException as e:
+
+        except httpx.HTTPError as e:
             raise Exception(f"Failed to get latest commit: {str(e)}")
-    
+
     async def create_issue_comment(self, issue_number: int, comment: str) -> str:
         """Create a comment on an issue or PR"""
         try:
-            url = f"{self.base_url}/repos/{self.owner}/{self.repo_name}/issues/{issue_number}/comments"
-            
+            url = f"{self._repo_base}/issues/{issue_number}/comments"
+
             data = {"body": comment}
-            
-            response = requests.post(url, headers=self.headers, json=data)
+
+            response = await self._request('POST', url, json=data)
             response.raise_for_status()
-            
-            comment_data = response.json()
+
+            comment_data = _json_loads(response.content)
             return comment_data["html_url"]
-            
-        except requests.exceptions.RequestException as e:
+
+        except httpx.HTTPError as e:
             raise Exception(f"Failed to create comment: {str(e)}")
-    
+
     async def get_file_content(self, file_path: str, branch: str = None) -> str:
         """Get the content of a file from the repository"""
         try:
-            url = f"{self.base_url}/repos/{self.owner}/{self.repo_name}/contents/{file_path}"
+            url = f"{self._repo_base}/contents/{file_path}"
             params = {}
             if branch:
                 params["ref"] = branch
-            
-            response = requests.get(url, headers=self.headers, params=params)
-            response.raise_for_status()
-            
-            file_data = response.json()
-            
+
+            file_data = await self._get_json(url, params=params or None)
+
             # Decode base64 content
-            import base64
             content = base64.b64decode(file_data["content"]).decode('utf-8')
             return content
-            
-        except requests.exceptions.RequestException as e:
-            if response.status_code == 404:
+
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code == 404:
                 raise Exception(f"File not found: {file_path}")
             else:
                 raise Exception(f"Failed to get file content: {str(e)}")
-    
+        except httpx.HTTPError as e:
+            raise Exception(f"Failed to get file content: {str(e)}")
+
+    async def get_files_content(self, paths: List[str], branch: str = None) -> Dict[str, str]:
+        """Fetch many files with one tree lookup plus concurrent blob reads
+
+        The Contents API costs one call per file; here a single
+        recursive tree listing resolves every path to its blob SHA and
+        the blobs are then fetched concurrently, so N files cost 1 + N
+        overlapped calls instead of N serial ones.
+        """
+        try:
+            if branch is None:
+                branch = (await self.get_repository_info())["default_branch"]
+
+            tree_url = f"{self._repo_base}/git/trees/{branch}"
+            tree_data = await self._get_json(tree_url, params={"recursive": "1"})
+
+            sha_by_path = {
+                entry["path"]: entry["sha"]
+                for entry in tree_data.get("tree", [])
+                if entry.get("type") == "blob"
+            }
+
+            missing = [p for p in paths if p not in sha_by_path]
+            if missing:
+                raise Exception(f"Files not found: {', '.join(missing)}")
+
+            async def _fetch_blob(path: str) -> str:
+                blob_url = f"{self._repo_base}/git/blobs/{sha_by_path[path]}"
+                blob = await self._get_json(blob_url)
+                return base64.b64decode(blob["content"]).decode('utf-8')
+
+            contents = await asyncio.gather(*[_fetch_blob(p) for p in paths])
+            return dict(zip(paths, contents))
+
+        except httpx.HTTPError as e:
+            raise Exception(f"Failed to get files content: {str(e)}")
+
     def validate_token(self) -> bool:
         """Validate that the GitHub token is working"""
         try:
             url = f"{self.base_url}/user"
-            response = requests.get(url, headers=self.headers)
+            response = self._sync_session.get(url)
             return response.status_code == 200
-            
+
         except:
             return False
-    
+
     async def fork_repository(self) -> str:
-        """Fork the repository to the authenticated user's account"""
+        """Fork the repository to the authenticated user's account
+
+        GitHub's 202 only means the fork was queued; the repository is
+        populated asynchronously and an immediate clone or API call
+        against it can fail. The fork is polled until it answers, so
+        callers can chain operations on the returned clone URL.
+        """
         try:
-            url = f"{self.base_url}/repos/{self.owner}/{self.repo_name}/forks"
-            
-            response = requests.post(url, headers=self.headers)
-            
+            url = f"{self._repo_base}/forks"
+
+            response = await self._request('POST', url)
+
             if response.status_code == 202:
-                fork_data = response.json()
+                fork_data = _json_loads(response.content)
+                await self._wait_for_fork(fork_data["owner"]["login"])
                 return fork_data["clone_url"]
             else:
                 response.raise_for_status()
-                
-        except requests.exceptions.RequestException as e:
+
+        except httpx.HTTPError as e:
             raise Exception(f"Failed to fork repository: {str(e)}")
-    
+
+    async def _wait_for_fork(self, new_owner: str, max_wait: float = 30.0):
+        """Poll the fork with backoff until GitHub finishes creating it"""
+        fork_url = f"{self.base_url}/repos/{new_owner}/{self.repo_name}"
+        deadline = time.monotonic() + max_wait
+        delay = 0.5
+        while True:
+            response = await self._request('GET', fork_url)
+            if response.status_code == 200:
+                return
+            # 404 while the fork is still materializing; anything else
+            # is a real error
+            if response.status_code != 404:
+                response.raise_for_status()
+            if time.monotonic() >= deadline:
+                raise Exception(f"Fork {new_owner}/{self.repo_name} not ready after {max_wait:.0f}s")
+            await asyncio.sleep(delay)
+            delay = min(delay * 1.5, 5.0)
+
     async def delete_branch(self, branch_name: str) -> bool:
         """Delete a branch from the repository"""
         try:
-            url = f"{self.base_url}/repos/{self.owner}/{self.repo_name}/git/refs/heads/{branch_name}"
-            
-            response = requests.delete(url, headers=self.headers)
-            
+            url = f"{self._repo_base}/git/refs/heads/{branch_name}"
+
+            response = await self._request('DELETE', url)
+
             return response.status_code == 204
-            
-        except requests.exceptions.RequestException as e:
+
+        except httpx.HTTPError as e:
             print(f"Warning: Failed to delete branch {branch_name}: {str(e)}")
             return False